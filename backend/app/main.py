@@ -2,26 +2,36 @@ from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
+from anyio import to_thread
 import uvicorn
 from decouple import config
 
 from app.routers import auth, budget, soa, minutes
 from app.services.database import init_db
+from app.utils.log_config import setup_logging
+from app.utils.responses import DownloadAwareGZipMiddleware, ORJSONResponse
+
+log_listener = setup_logging()
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Document generation and sync dependencies share anyio's threadpool;
+    # raise the default limit of 40 so slow generations don't starve auth
+    to_thread.current_default_thread_limiter().total_tokens = 64
     await init_db()
     yield
     # Shutdown
-    # Add any cleanup logic here if needed
+    await budget.close_http_client()
+    log_listener.stop()
 
 app = FastAPI(
     title="TGYN Admin Portal API",
     description="Backend API for Teck Ghee Youth Network Admin Portal",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -44,6 +54,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses; xlsx/docx downloads are already zip archives and are sent as-is
+app.add_middleware(DownloadAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(budget.router, prefix="/api/budget", tags=["Budget"])
@@ -59,9 +72,15 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    # Auto-reload only works with a single worker, so it is for development only.
+    # In production set RELOAD=False and WORKERS, or use gunicorn_conf.py
+    reload = config("RELOAD", default=True, cast=bool)
     uvicorn.run(
-        "main:app",
+        "app.main:app",
         host="0.0.0.0",
         port=int(config("PORT", default=8000)),
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        workers=1 if reload else config("WORKERS", default=1, cast=int),
+        reload=reload
     )
\ No newline at end of file
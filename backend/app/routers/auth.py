@@ -1,14 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional
 from datetime import timedelta
 
-from app.services.auth_service import authenticate_user, create_access_token, verify_token
+from app.services.auth_service import (
+    authenticate_user,
+    create_access_token,
+    verify_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+)
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter()
 security = HTTPBearer()
 
+ACCESS_TOKEN_TTL = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -23,29 +32,30 @@ class UserResponse(BaseModel):
     role: str
     email: str
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", responses={200: {"model": TokenResponse}})
 async def login(login_data: LoginRequest):
     """Authenticate user and return JWT token"""
-    user = authenticate_user(login_data.username, login_data.password)
+    # Reads the Users sheet and verifies the password hash; keep both off the event loop
+    user = await run_in_threadpool(authenticate_user, login_data.username, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=BEARER_CHALLENGE,
         )
 
-    access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
         data={"sub": user["username"], "role": user["role"]},
-        expires_delta=access_token_expires
+        expires_delta=ACCESS_TOKEN_TTL
     )
 
-    return TokenResponse(
-        access_token=access_token,
-        user=user
-    )
+    return ORJSONResponse({
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user
+    })
 
-@router.get("/me", response_model=UserResponse)
+@router.get("/me", responses={200: {"model": UserResponse}})
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user information"""
     token_data = verify_token(credentials.credentials)
@@ -53,14 +63,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=BEARER_CHALLENGE,
         )
 
-    return UserResponse(
-        username=token_data["sub"],
-        role=token_data.get("role", "user"),
-        email=""  # You might want to store this in the token or fetch from DB
-    )
+    return ORJSONResponse({
+        "username": token_data["sub"],
+        "role": token_data.get("role", "user"),
+        "email": ""  # You might want to store this in the token or fetch from DB
+    })
 
 def get_current_user_dependency(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current user for protected routes"""
@@ -69,6 +79,6 @@ def get_current_user_dependency(credentials: HTTPAuthorizationCredentials = Depe
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=BEARER_CHALLENGE,
         )
     return token_data
\ No newline at end of file
@@ -1,13 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-import io
+from cachetools import TTLCache
+import hashlib
+import httpx
+import orjson
+import pandas as pd
+import threading
 
 from app.services.budget_service import BudgetService, BudgetRequest
 from app.routers.auth import get_current_user_dependency
 from app.utils.config import get_telegram_token, get_telegram_group_id
+from app.utils.responses import ORJSONResponse, iter_chunks
 
 router = APIRouter()
 
+# Item count above which /preview falls back to the vectorized pandas path
+PREVIEW_PANDAS_THRESHOLD = 1000
+
+# Shared async client for Telegram calls so they don't block the event loop.
+# Pooled HTTP/2 connections skip a TLS handshake to api.telegram.org per call
+_http = httpx.AsyncClient(
+    http2=True,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=8)
+)
+
+async def close_http_client():
+    """Close the shared Telegram HTTP client (called on app shutdown)"""
+    await _http.aclose()
+
+# Generated workbooks keyed by a hash of the request, so downloading and then
+# sending the same budget to Telegram only builds the file once
+_excel_cache = TTLCache(maxsize=128, ttl=300)
+_excel_cache_lock = threading.Lock()
+
+def _generate_budget_excel_cached(request: BudgetRequest) -> bytes:
+    """Generate budget Excel file, reusing a recent result for an identical request"""
+    key = hashlib.blake2b(orjson.dumps(request.model_dump(), option=orjson.OPT_SORT_KEYS)).digest()
+    with _excel_cache_lock:
+        excel_data = _excel_cache.get(key)
+    if excel_data is None:
+        excel_data = BudgetService.generate_budget_excel(request)
+        with _excel_cache_lock:
+            _excel_cache[key] = excel_data
+    return excel_data
+
 @router.post("/generate")
 async def generate_budget(
     request: BudgetRequest,
@@ -15,11 +53,11 @@ async def generate_budget(
 ):
     """Generate budget Excel file"""
     try:
-        excel_data = BudgetService.generate_budget_excel(request)
+        excel_data = await run_in_threadpool(_generate_budget_excel_cached, request)
         filename = f"{request.event_name}_Budget.xlsx"
 
         return StreamingResponse(
-            io.BytesIO(excel_data),
+            iter_chunks(excel_data),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -51,29 +89,33 @@ async def preview_budget(
 ):
     """Generate budget and return data for preview"""
     try:
-        import pandas as pd
-
-        income_df = pd.DataFrame(request.income_items)
-        expense_df = pd.DataFrame(request.expense_items)
-
-        # Calculate totals
-        if not income_df.empty:
-            income_df = BudgetService.calculate_budget_totals(income_df)
-        if not expense_df.empty:
-            expense_df = BudgetService.calculate_budget_totals(expense_df)
-
-        # Calculate summary
-        income_total = income_df["$ (Total)"].sum() if not income_df.empty else 0
-        expense_total = expense_df["$ (Total)"].sum() if not expense_df.empty else 0
-        net = income_total - expense_total
-
-        return {
+        if max(len(request.income_items), len(request.expense_items)) <= PREVIEW_PANDAS_THRESHOLD:
+            # Typical budgets have a few dozen items; plain Python beats building DataFrames
+            income_items, income_total = BudgetService.calculate_item_totals(request.income_items)
+            expense_items, expense_total = BudgetService.calculate_item_totals(request.expense_items)
+        else:
+            income_df = pd.DataFrame(request.income_items)
+            expense_df = pd.DataFrame(request.expense_items)
+
+            # Calculate totals
+            if not income_df.empty:
+                income_df = BudgetService.calculate_budget_totals(income_df)
+            if not expense_df.empty:
+                expense_df = BudgetService.calculate_budget_totals(expense_df)
+
+            income_total = income_df["$ (Total)"].sum() if not income_df.empty else 0
+            expense_total = expense_df["$ (Total)"].sum() if not expense_df.empty else 0
+            income_items = income_df.to_dict('records') if not income_df.empty else []
+            expense_items = expense_df.to_dict('records') if not expense_df.empty else []
+
+        # Return the response directly so FastAPI skips jsonable_encoder
+        return ORJSONResponse({
             "income_total": income_total,
             "expense_total": expense_total,
-            "net_amount": net,
-            "income_items": income_df.to_dict('records') if not income_df.empty else [],
-            "expense_items": expense_df.to_dict('records') if not expense_df.empty else []
-        }
+            "net_amount": income_total - expense_total,
+            "income_items": income_items,
+            "expense_items": expense_items
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating budget preview: {str(e)}")
 
@@ -84,13 +126,8 @@ async def send_budget_to_telegram(
 ):
     """Generate budget and send to Telegram"""
     try:
-        import requests
-        import json
-        import os
-        from decouple import config
-
         # Generate Excel file
-        excel_data = BudgetService.generate_budget_excel(request)
+        excel_data = await run_in_threadpool(_generate_budget_excel_cached, request)
         filename = f"{request.event_name}_Budget.xlsx"
 
         # Get Telegram credentials from configuration
@@ -102,13 +139,14 @@ async def send_budget_to_telegram(
 
         # Send document
         url = f"https://api.telegram.org/bot{token}/sendDocument"
-        files = {'document': (filename, io.BytesIO(excel_data), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
+        files = {'document': (filename, excel_data, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
         data = {
             'chat_id': group_id,
             'caption': f"📄 {filename} - Ready for approval"
         }
 
-        response = requests.post(url, files=files, data=data, timeout=30)
+        # The poll must follow the document in the chat, so these stay sequential
+        response = await _http.post(url, files=files, data=data)
         doc_result = response.json()
 
         if not doc_result.get('ok'):
@@ -124,7 +162,7 @@ async def send_budget_to_telegram(
             'allows_multiple_answers': False
         }
 
-        poll_response = requests.post(poll_url, data=poll_data, timeout=30)
+        poll_response = await _http.post(poll_url, data=poll_data)
         poll_result = poll_response.json()
 
         if not poll_result.get('ok'):
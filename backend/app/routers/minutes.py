@@ -1,14 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-import io
-from typing import Optional
+from typing import Dict, Optional
+import logging
+import re
+from pydantic import TypeAdapter, ValidationError
 
 from app.services.minutes_service import MinutesService, MeetingMinutesRequest
 from app.services.attendance_service import AttendanceService
 from app.routers.auth import get_current_user_dependency
+from app.utils.responses import iter_chunks
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Matches Gemini rate-limit / quota errors in exception messages
+_QUOTA_RE = re.compile(r"429|quota|exceeded", re.IGNORECASE)
+
+# Parses and validates the attendance form field in one pass
+_attendance_adapter = TypeAdapter(Dict[str, str])
+
 @router.post("/generate")
 async def generate_minutes(
     meeting_content: str = Form(...),
@@ -44,7 +56,8 @@ async def generate_minutes(
         )
         
         # Process content and generate minutes
-        word_data = minutes_service.process_content_and_generate_minutes(
+        word_data = await run_in_threadpool(
+            minutes_service.process_content_and_generate_minutes,
             meeting_content,
             request
         )
@@ -53,21 +66,17 @@ async def generate_minutes(
         filename = f"{request.meeting_title.replace(' ', '_')}_Minutes.docx"
 
         return StreamingResponse(
-            io.BytesIO(word_data),
+            iter_chunks(word_data),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error generating meeting minutes: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.exception("Error generating meeting minutes")
         
         # Check for quota error
-        error_msg = str(e)
-        if "429" in error_msg or "quota" in error_msg.lower() or "exceeded" in error_msg.lower():
+        if _QUOTA_RE.search(str(e)):
             raise HTTPException(
                 status_code=429, 
                 detail="Gemini API quota exceeded. Please wait a few minutes and try again, or check your API billing."
@@ -96,28 +105,21 @@ async def preview_minutes(
             )
 
         # Create service instance
-        print("Creating MinutesService instance...")
         try:
             minutes_service = MinutesService()
-            print("MinutesService created successfully")
         except Exception as e:
-            print(f"Error creating MinutesService: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception("Error creating MinutesService")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error initializing service: {str(e)}"
             )
 
         # Process with Gemini (with fallback if it fails)
-        print("Processing with Gemini...")
         try:
-            processed_data = minutes_service.process_content_with_gemini(meeting_content)
-            print("Processing complete")
+            processed_data = await minutes_service.aprocess_content_with_gemini(meeting_content)
         except Exception as gemini_error:
-            print(f"Gemini processing failed: {gemini_error}")
             # Create fallback structure from content
-            print("Using fallback: creating basic structure from content...")
+            logger.warning("Gemini processing failed, using fallback structure: %s", gemini_error)
             processed_data = {
                 "meeting_title": meeting_title or "Meeting",
                 "agenda_items": [
@@ -132,7 +134,6 @@ async def preview_minutes(
                 "extracted_location": None,
                 "extracted_company": None
             }
-            print("Fallback structure created")
 
         return {
             "success": True,
@@ -142,14 +143,10 @@ async def preview_minutes(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error previewing PowerPoint content: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.exception("Error previewing PowerPoint content")
         
         # Check for quota error
-        error_msg = str(e)
-        if "429" in error_msg or "quota" in error_msg.lower() or "exceeded" in error_msg.lower():
+        if _QUOTA_RE.search(str(e)):
             raise HTTPException(
                 status_code=429, 
                 detail="Gemini API quota exceeded. Please wait a few minutes and try again, or check your API billing."
@@ -166,17 +163,15 @@ async def get_members(
 ):
     """Get list of members from Google Sheets"""
     try:
-        attendance_service = AttendanceService()
-        members = attendance_service.get_members()
+        # Sheets reads (and their rate-limit retries) block; keep them off the event loop
+        attendance_service = await run_in_threadpool(AttendanceService)
+        members = await run_in_threadpool(attendance_service.get_members)
         return {
             "success": True,
             "members": members
         }
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error getting members: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.exception("Error getting members")
         raise HTTPException(
             status_code=500,
             detail=f"Error getting members: {str(e)}"
@@ -190,34 +185,28 @@ async def submit_attendance(
 ):
     """Submit attendance to Google Sheets"""
     try:
-        import json
-        print(f"Received attendance submission - Date: {date}")
-        print(f"Attendance data (raw): {attendance}")
+        logger.debug("Received attendance submission - Date: %s", date)
         
-        attendance_dict = json.loads(attendance)
-        print(f"Parsed attendance dict: {attendance_dict}")
+        attendance_dict = _attendance_adapter.validate_json(attendance)
+        logger.debug("Parsed attendance dict: %s", attendance_dict)
         
-        attendance_service = AttendanceService()
-        result = attendance_service.submit_attendance(date, attendance_dict)
+        attendance_service = await run_in_threadpool(AttendanceService)
+        result = await run_in_threadpool(attendance_service.submit_attendance, date, attendance_dict)
         
-        print(f"Attendance submission successful: {result}")
+        logger.debug("Attendance submission successful: %s", result)
         
         return {
             "success": True,
             "message": "Attendance submitted successfully"
         }
-    except json.JSONDecodeError as json_err:
-        print(f"JSON decode error: {json_err}")
-        print(f"Raw attendance string: {attendance}")
+    except ValidationError as validation_err:
+        logger.warning("Invalid attendance data: %s", validation_err)
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid attendance data format: {str(json_err)}"
+            detail=f"Invalid attendance data format: {str(validation_err)}"
         )
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error submitting attendance: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.exception("Error submitting attendance")
         raise HTTPException(
             status_code=500,
             detail=f"Error submitting attendance: {str(e)}"
@@ -238,14 +227,14 @@ async def upload_attendance_file(
             raise HTTPException(status_code=400, detail="File is empty")
         
         # Parse attendance from file
-        attendance_service = AttendanceService()
-        attendance_dict = attendance_service.parse_attendance_file(file_bytes, file.filename)
+        attendance_service = await run_in_threadpool(AttendanceService)
+        attendance_dict = await run_in_threadpool(attendance_service.parse_attendance_file, file_bytes, file.filename)
         
         if not attendance_dict:
             raise HTTPException(status_code=400, detail="No attendance data found in file. Please ensure names are in the first column and ticks/checkmarks are in subsequent columns.")
         
         # Submit parsed attendance
-        result = attendance_service.submit_attendance(date, attendance_dict)
+        result = await run_in_threadpool(attendance_service.submit_attendance, date, attendance_dict)
         
         return {
             "success": True,
@@ -256,10 +245,7 @@ async def upload_attendance_file(
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error uploading attendance file: {str(e)}")
-        print(f"Traceback: {error_trace}")
+        logger.exception("Error uploading attendance file")
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading attendance file: {str(e)}"
@@ -1,45 +1,136 @@
 import gspread
-from google.oauth2.service_account import Credentials
-import json
+from gspread.utils import Dimension, ValueInputOption, rowcol_to_a1
 import os
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
+import numpy as np
 import pandas as pd
 import io
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from cachetools import TTLCache
+from app.services.database import get_sheets_client
 from app.utils.config import get_members_sheets_url, get_attendance_sheets_url, get_google_service_account_file
 
+# Tick indicators for uploaded attendance files: ✓, ✔, ☑, √, X, Yes, Y, 1, P, Present, True, T.
+# Matching is by substring and every word indicator contains one of the single
+# characters (yes -> y, present -> p, true -> t), so a character-class test is equivalent.
+_TICK_RE = re.compile(r"[✓✔☑√xyp1t]", re.IGNORECASE)
+# Most ticked cells hold exactly one of the indicators, which a set lookup answers without a regex scan
+_TICK_EXACT = frozenset({"✓", "✔", "☑", "√", "x", "yes", "y", "1", "p", "present", "true", "t"})
 
-class AttendanceService:
-    def __init__(self):
-        self.gc = None
-        self._initialize_connection()
+# Date formats accepted in attendance sheet headers, in order of preference
+_HEADER_DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%B %d, %Y", "%d-%b-%Y", "%d-%b-%y"]
+
+# Sheet contents keyed by spreadsheet URL, so back-to-back reads (e.g. showing the
+# latest attendance and then looking up a date) share one full-sheet fetch
+SHEET_CACHE_TTL = 30
+_values_cache = TTLCache(maxsize=32, ttl=SHEET_CACHE_TTL)
+# Header rows on their own, used to locate a date column without a full-sheet read
+_header_cache = TTLCache(maxsize=32, ttl=SHEET_CACHE_TTL)
+# Opened spreadsheets keyed by URL, saves the metadata lookup open_by_url does
+_spreadsheet_cache: Dict[str, gspread.Spreadsheet] = {}
+# First worksheet of each spreadsheet keyed by URL. Spreadsheet.sheet1 refetches the
+# sheet metadata on every access; a kept Worksheet reads values in a single request
+_worksheet_cache: Dict[str, gspread.Worksheet] = {}
+_sheet_cache_lock = threading.Lock()
 
-    def _initialize_connection(self):
-        """Initialize Google Sheets connection"""
+# gspread client shared by every AttendanceService. Authorizing reads the service
+# account file and fetches an OAuth token, so it is done once per process;
+# google-auth refreshes the token as needed.
+_gc: Optional[gspread.Client] = None
+_gc_lock = threading.Lock()
+
+def _get_gc() -> gspread.Client:
+    """Get the shared Google Sheets client, initializing it on first use"""
+    global _gc
+    with _gc_lock:
+        if _gc is not None:
+            return _gc
         try:
             creds_file_path = get_google_service_account_file()
             
             if not os.path.exists(creds_file_path):
                 raise FileNotFoundError(f"Google service account JSON file not found at {creds_file_path}")
 
-            # Load credentials from JSON file
-            with open(creds_file_path, 'r') as f:
-                creds_dict = json.load(f)
-
-            creds = Credentials.from_service_account_info(
-                creds_dict,
-                scopes=[
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-            )
-
-            self.gc = gspread.authorize(creds)
+            # Same cached client as GoogleSheetsDB when both use the same file
+            _gc = get_sheets_client(creds_file_path)
             print("Google Sheets connection initialized successfully")
+            return _gc
         except Exception as e:
             print(f"Error initializing Google Sheets connection: {e}")
             raise
 
+def _column_has_tick(column: pd.Series) -> pd.Series:
+    """Flag cells of a string column that contain a tick indicator"""
+    cells = column.str.strip().str.lower()
+    has_tick = cells.isin(_TICK_EXACT)
+    # Fall back to the regex only for non-empty cells that aren't an exact indicator
+    remaining = ~has_tick & (cells != "")
+    if remaining.any():
+        has_tick |= cells[remaining].str.contains(_TICK_RE).reindex(cells.index, fill_value=False).astype(bool)
+    return has_tick
+
+def _attendance_from_column(all_values: List[List[str]], date_col_index: int) -> Dict[str, str]:
+    """Map each name in column B to its status in the given date column"""
+    if len(all_values) < 2:
+        return {}
+    # get_all_values pads rows to the same width, so the sheet converts to a 2D array
+    values = np.array(all_values[1:], dtype=str)
+    # Names are in column B (index 1), not column A
+    names = np.char.strip(values[:, 1])
+    statuses = np.char.strip(values[:, date_col_index])
+    mask = names != ''
+    statuses = np.where(statuses[mask] == '', 'Not Present', statuses[mask])
+    return dict(zip(names[mask].tolist(), statuses.tolist()))
+
+class AttendanceService:
+    def __init__(self):
+        self.gc = _get_gc()
+
+    def _open_spreadsheet(self, url: str) -> gspread.Spreadsheet:
+        """Open a spreadsheet by URL, reusing the handle from earlier calls"""
+        with _sheet_cache_lock:
+            spreadsheet = _spreadsheet_cache.get(url)
+        if spreadsheet is None:
+            spreadsheet = self.gc.open_by_url(url)
+            with _sheet_cache_lock:
+                _spreadsheet_cache[url] = spreadsheet
+        return spreadsheet
+
+    def _first_worksheet(self, url: str) -> gspread.Worksheet:
+        """Get the first worksheet of a spreadsheet, reusing the handle from earlier calls"""
+        with _sheet_cache_lock:
+            worksheet = _worksheet_cache.get(url)
+        if worksheet is None:
+            worksheet = self._open_spreadsheet(url).sheet1
+            with _sheet_cache_lock:
+                _worksheet_cache[url] = worksheet
+        return worksheet
+
+    def _get_header_row_cached(self, url: str) -> List[str]:
+        """Get the header row of the first worksheet, reusing a fetch from the last SHEET_CACHE_TTL seconds"""
+        with _sheet_cache_lock:
+            header_row = _header_cache.get(url)
+        if header_row is None:
+            header_row = self._first_worksheet(url).row_values(1)
+            with _sheet_cache_lock:
+                _header_cache[url] = header_row
+        return header_row
+
+    def _get_all_values_cached(self, url: str, refresh: bool = False) -> List[List[str]]:
+        """Get all values of the first worksheet, reusing a fetch from the last SHEET_CACHE_TTL seconds"""
+        if not refresh:
+            with _sheet_cache_lock:
+                all_values = _values_cache.get(url)
+            if all_values is not None:
+                return all_values
+        all_values = self._first_worksheet(url).get_all_values()
+        with _sheet_cache_lock:
+            _values_cache[url] = all_values
+        return all_values
+
     def get_members(self) -> List[Dict[str, str]]:
         """Get list of members from members Google Sheet"""
         try:
@@ -47,20 +138,24 @@ class AttendanceService:
             if not members_url:
                 raise ValueError("Members Google Sheets URL not configured")
             
-            spreadsheet = self.gc.open_by_url(members_url)
-            
-            # Try to get the first worksheet (or a specific one if needed)
-            worksheet = spreadsheet.sheet1
+            # Names and addresses live in columns A:B of the first sheet. A single
+            # batchGet on the spreadsheet also skips the worksheet metadata lookup
+            response = self._open_spreadsheet(members_url).values_batch_get(ranges=['A:B'])
+            value_ranges = response.get('valueRanges', [])
+            rows = value_ranges[0].get('values', []) if value_ranges else []
+            if not rows:
+                return []
             
-            # Get all records (assuming first row is headers)
-            records = worksheet.get_all_records()
+            # First row is headers: Name, How to Address (or similar)
+            header = [str(cell).strip() for cell in rows[0]]
+            name_idx = next((header.index(h) for h in ('Name', 'name') if h in header), 0)
+            address_idx = next((header.index(h) for h in ('How to Address', 'how_to_address', 'Address') if h in header), None)
             
             # Extract member names and how to address them
             members = []
-            for record in records:
-                # Assuming columns are: Name, How to Address (or similar)
-                name = record.get('Name', '') or record.get('name', '') or list(record.values())[0] if record else ''
-                address = record.get('How to Address', '') or record.get('how_to_address', '') or record.get('Address', '') or name
+            for row in rows[1:]:
+                name = row[name_idx] if name_idx < len(row) else ''
+                address = row[address_idx] if address_idx is not None and address_idx < len(row) else ''
                 
                 if name:
                     members.append({
@@ -68,17 +163,6 @@ class AttendanceService:
                         "address": address or name
                     })
             
-            # If no records found, try getting all values from column A (names)
-            if not members:
-                all_values = worksheet.get_all_values()
-                if len(all_values) > 1:  # Skip header row
-                    for row in all_values[1:]:
-                        if row and row[0]:  # If first column has a value
-                            members.append({
-                                "name": row[0],
-                                "address": row[0]
-                            })
-            
             return members
         except Exception as e:
             print(f"Error getting members: {e}")
@@ -92,17 +176,20 @@ class AttendanceService:
             if not attendance_url:
                 raise ValueError("Attendance Google Sheets URL not configured")
             
-            spreadsheet = self.gc.open_by_url(attendance_url)
-            worksheet = spreadsheet.sheet1
+            # A recent full read of the sheet already holds the column, otherwise
+            # only the header row is needed to find it
+            with _sheet_cache_lock:
+                all_values = _values_cache.get(attendance_url)
             
-            # Get all values
-            all_values = worksheet.get_all_values()
+            if all_values is not None:
+                header_row = all_values[0] if all_values else []
+            else:
+                header_row = self._get_header_row_cached(attendance_url)
             
-            if not all_values:
+            if not header_row:
                 return {}
             
             # Find date column
-            header_row = all_values[0] if all_values else []
             date_col_index = None
             
             # Format date to match expected format (YYYY-MM-DD)
@@ -122,20 +209,24 @@ class AttendanceService:
                 return {}
             
             # Get attendance data
-            # Names are in column B (index 1), not column A
-            attendance_dict = {}
-            for row_idx in range(1, len(all_values)):  # Start from row 2 (index 1)
-                if row_idx < len(all_values) and all_values[row_idx]:
-                    name = all_values[row_idx][1] if len(all_values[row_idx]) > 1 and all_values[row_idx][1] else ''
-                    if name and name.strip():
-                        name_clean = name.strip()
-                        # Get attendance status from the date column
-                        if date_col_index < len(all_values[row_idx]):
-                            status = all_values[row_idx][date_col_index].strip() if all_values[row_idx][date_col_index] else 'Not Present'
-                            attendance_dict[name_clean] = status
-                        else:
-                            attendance_dict[name_clean] = 'Not Present'
+            if all_values is not None:
+                return _attendance_from_column(all_values, date_col_index)
+            
+            # Fetch just the names (column B) and the date column in one batchGet,
+            # instead of every date column in the sheet
+            date_col = rowcol_to_a1(1, date_col_index + 1)[:-1]
+            names_range, status_range = self._first_worksheet(attendance_url).batch_get(
+                ["B2:B", f"{date_col}2:{date_col}"],
+                major_dimension=Dimension.cols,
+            )
+            names = names_range[0] if names_range else []
+            statuses = status_range[0] if status_range else []
             
+            attendance_dict = {}
+            for name, status in zip_longest(names, statuses, fillvalue=''):
+                name = name.strip()
+                if name:
+                    attendance_dict[name] = status.strip() or 'Not Present'
             return attendance_dict
         except Exception as e:
             print(f"Error getting attendance for date {date}: {e}")
@@ -151,75 +242,51 @@ class AttendanceService:
             if not attendance_url:
                 raise ValueError("Attendance Google Sheets URL not configured")
             
-            spreadsheet = self.gc.open_by_url(attendance_url)
-            worksheet = spreadsheet.sheet1
-            
             # Get all values
-            all_values = worksheet.get_all_values()
+            all_values = self._get_all_values_cached(attendance_url)
             
             if not all_values:
                 return {}, ""
             
             # Find the most recent date column
             header_row = all_values[0] if all_values else []
-            date_col_index = None
-            most_recent_date = None
-            most_recent_date_str = ""
-            
-            # Parse all date columns and find the most recent one
-            from datetime import datetime
             
-            date_columns = []  # List of (index, date_string, datetime_obj)
+            # Parse all date columns and find the most recent one. Each format is tried
+            # over the whole header at once; earlier formats win, as with strptime in order
+            headers = pd.Series(header_row[2:], dtype=str).str.strip()  # Skip column A and column B (B has names)
+            parsed = pd.Series(pd.NaT, index=headers.index, dtype="datetime64[ns]")
+            for date_format in _HEADER_DATE_FORMATS:
+                parsed = parsed.fillna(pd.to_datetime(headers, format=date_format, errors="coerce"))
             
-            for idx, header in enumerate(header_row):
-                if idx == 0 or idx == 1:  # Skip column A and column B (B has names)
-                    continue
-                header_clean = header.strip() if header else ''
-                if not header_clean:
-                    continue
-                
-                # Try to parse as date in various formats
-                date_obj = None
-                for date_format in ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%B %d, %Y", "%d-%b-%Y", "%d-%b-%y"]:
-                    try:
-                        date_obj = datetime.strptime(header_clean, date_format)
-                        date_columns.append((idx, header_clean, date_obj))
-                        break
-                    except ValueError:
-                        continue
-            
-            if not date_columns:
+            if parsed.isna().all():
                 print("No valid date columns found in attendance sheet")
                 return {}, ""
             
-            # Sort by date (most recent first)
-            date_columns.sort(key=lambda x: x[2], reverse=True)
-            date_col_index, most_recent_date_str, most_recent_date = date_columns[0]
+            # idxmax returns the first column among equal dates
+            best = parsed.idxmax()
+            date_col_index = best + 2
+            most_recent_date_str = headers[best]
             
             print(f"Using most recent date: {most_recent_date_str} (column index: {date_col_index})")
             
             # Get attendance data from the most recent date column
-            # Names are in column B (index 1), not column A
-            attendance_dict = {}
-            for row_idx in range(1, len(all_values)):  # Start from row 2 (index 1)
-                if row_idx < len(all_values) and all_values[row_idx]:
-                    name = all_values[row_idx][1] if len(all_values[row_idx]) > 1 and all_values[row_idx][1] else ''
-                    if name and name.strip():
-                        name_clean = name.strip()
-                        # Get attendance status from the date column
-                        if date_col_index < len(all_values[row_idx]):
-                            status = all_values[row_idx][date_col_index].strip() if all_values[row_idx][date_col_index] else 'Not Present'
-                            attendance_dict[name_clean] = status
-                        else:
-                            attendance_dict[name_clean] = 'Not Present'
-            
-            return attendance_dict, most_recent_date_str
+            return _attendance_from_column(all_values, date_col_index), most_recent_date_str
         except Exception as e:
             print(f"Error getting most recent attendance: {e}")
             import traceback
             print(traceback.format_exc())
             return {}, ""
 
+    def get_members_and_recent_attendance(self) -> Tuple[List[Dict[str, str]], Dict[str, str], str]:
+        """Get members and the most recent attendance, fetching both sheets concurrently
+        Returns tuple of (members, attendance_dict, date_used)"""
+        # The two reads are independent network calls, so the wait is the slower of the two
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            members_future = executor.submit(self.get_members)
+            attendance_future = executor.submit(self.get_most_recent_attendance)
+            attendance_data, date_used = attendance_future.result()
+            return members_future.result(), attendance_data, date_used
+
     def submit_attendance(self, date: str, attendance: Dict[str, str]) -> bool:
         """Submit attendance to attendance Google Sheet"""
         try:
@@ -227,15 +294,15 @@ class AttendanceService:
             if not attendance_url:
                 raise ValueError("Attendance Google Sheets URL not configured")
             
-            spreadsheet = self.gc.open_by_url(attendance_url)
-            worksheet = spreadsheet.sheet1
+            worksheet = self._first_worksheet(attendance_url)
             
             # Format date to match expected format (YYYY-MM-DD or keep as is)
             # The date comes from frontend as YYYY-MM-DD format
             formatted_date = date
             
-            # Get all values to find the date column
-            all_values = worksheet.get_all_values()
+            # Get all values to find the date column. Always read fresh before writing
+            # so row numbers can't come from a stale copy
+            all_values = self._get_all_values_cached(attendance_url, refresh=True)
             
             if not all_values:
                 raise ValueError("Attendance sheet is empty")
@@ -253,6 +320,9 @@ class AttendanceService:
                     date_col_index = idx
                     break
             
+            # All cell writes are collected here and sent in a single batch_update call
+            updates = []
+
             # If date not found, add it to the next available column
             if date_col_index is None:
                 # Find the next empty column after B (index 1)
@@ -270,68 +340,82 @@ class AttendanceService:
                 
                 # Update header with date (gspread uses 1-indexed, so date_col_index + 1)
                 # date_col_index is 0-indexed from Python list, so we add 1 for gspread
-                worksheet.update_cell(1, date_col_index + 1, formatted_date)
-                print(f"Added date '{formatted_date}' to column {date_col_index + 1} (B={2})")
+                updates.append({"range": rowcol_to_a1(1, date_col_index + 1), "values": [[formatted_date]]})
+                print(f"Adding date '{formatted_date}' to column {date_col_index + 1} (B={2})")
             
             # Get all names from column B (index 1, starting from row 2) with case-insensitive matching
             # Normalize names by stripping whitespace to ensure consistent matching
+            # Keep the sheet row number with each name so blank rows don't shift the updates
             names = []
-            names_lower_to_original = {}  # Map lowercase to original casing
-            for row_idx in range(1, len(all_values)):  # Start from row 2 (index 1)
-                if row_idx < len(all_values) and all_values[row_idx]:
-                    name = all_values[row_idx][1] if len(all_values[row_idx]) > 1 and all_values[row_idx][1] else ''
-                    if name and name.strip():  # Only add non-empty names
-                        name_clean = name.strip()  # Normalize by stripping whitespace
-                        names.append(name_clean)
-                        names_lower_to_original[name_clean.lower()] = name_clean
+            names_lower = []  # Lowercased once here for the case-insensitive lookups below
+            name_rows = []
+            for row_number, row in enumerate(all_values[1:], start=2):  # Start from row 2 (gspread rows are 1-indexed)
+                if len(row) <= 1:
+                    continue
+                name_clean = row[1].strip() if row[1] else ''  # Normalize by stripping whitespace
+                if not name_clean:  # Only add non-empty names
+                    continue
+                names.append(name_clean)
+                names_lower.append(name_clean.lower())
+                name_rows.append(row_number)
             
             print(f"Found {len(names)} existing names in sheet: {names[:5]}...")
             print(f"Updating attendance for date column index: {date_col_index} (column {date_col_index + 1})")
             
-            # Create case-insensitive lookup for attendance data
+            # Create case-insensitive lookup for attendance data, normalizing each name once.
             # Normalize names by stripping whitespace to ensure proper matching
-            attendance_lower = {name.strip().lower(): (name.strip(), status) for name, status in attendance.items()}
+            attendance_lower = {}  # Last entry wins for names already in the sheet
+            attendance_first = {}  # First entry wins for new members
+            for name, status in attendance.items():
+                name_normalized = name.strip()
+                name_lower = name_normalized.lower()
+                attendance_lower[name_lower] = (name_normalized, status)
+                attendance_first.setdefault(name_lower, (name_normalized, status))
             
             # Update attendance for each member (case-insensitive matching)
-            for row_idx, name in enumerate(names, start=2):  # Start from row 2 (1-indexed)
-                name_lower = name.lower()
-                
+            for row_idx, name_lower in zip(name_rows, names_lower):
                 # Find matching attendance (case-insensitive)
                 if name_lower in attendance_lower:
                     matched_name, status = attendance_lower[name_lower]
-                    # Update the cell (row, col) - both are 1-indexed in gspread
-                    # date_col_index is 0-indexed from list, so add 1 for gspread
-                    worksheet.update_cell(row_idx, date_col_index + 1, status)
-                    print(f"Updated {name}: {status} at row {row_idx}, col {date_col_index + 1}")
                 else:
                     # If not in attendance dict, set to "Not Present"
-                    worksheet.update_cell(row_idx, date_col_index + 1, "Not Present")
+                    status = "Not Present"
+                # Cell (row, col) - both are 1-indexed in gspread
+                # date_col_index is 0-indexed from list, so add 1 for gspread
+                updates.append({"range": rowcol_to_a1(row_idx, date_col_index + 1), "values": [[status]]})
             
             # Also add any new members that aren't in the sheet yet (case-insensitive check)
-            existing_names_lower = set(name.lower() for name in names)
-            new_members = {}
-            for name, status in attendance.items():
-                # Normalize name by stripping whitespace for consistent matching
-                name_normalized = name.strip()
-                name_lower = name_normalized.lower()
-                if name_lower not in existing_names_lower:
-                    # Avoid duplicates by checking if we already added this name
-                    if name_lower not in new_members:
-                        new_members[name_lower] = (name_normalized, status)
+            existing_names_lower = set(names_lower)
+            new_members = {
+                name_lower: entry
+                for name_lower, entry in attendance_first.items()
+                if name_lower not in existing_names_lower
+            }
             
             if new_members:
-                # Add new members to the end
-                next_row = len(all_values) + 1
+                # Add new members to the end as one block of rows spanning column B
+                # (names) to the date column, like append_rows but in the same batch
+                first_new_row = len(all_values) + 1
+                new_rows = []
                 for name_lower, (original_name, status) in new_members.items():
                     # Check if this name already exists in the sheet (double-check)
                     if name_lower not in existing_names_lower:
-                        # Add name in column B (index 1, which is column 2 in 1-indexed)
-                        worksheet.update_cell(next_row, 2, original_name)
-                        # Add attendance status
-                        worksheet.update_cell(next_row, date_col_index + 1, status)
+                        row = [''] * date_col_index
+                        row[0] = original_name  # Column B
+                        row[-1] = status  # Date column
+                        new_rows.append(row)
                         existing_names_lower.add(name_lower)  # Track to prevent duplicates
-                        print(f"Added new member {original_name}: {status} at row {next_row}")
-                        next_row += 1
+                        print(f"Adding new member {original_name}: {status} at row {first_new_row + len(new_rows) - 1}")
+                if new_rows:
+                    updates.append({"range": rowcol_to_a1(first_new_row, 2), "values": new_rows})
+            
+            if updates:
+                worksheet.batch_update(updates, value_input_option=ValueInputOption.user_entered)
+                print(f"Wrote {len(updates)} ranges in one batch update")
+                # The cached copies no longer match the sheet
+                with _sheet_cache_lock:
+                    _values_cache.pop(attendance_url, None)
+                    _header_cache.pop(attendance_url, None)
             
             return True
         except Exception as e:
@@ -356,81 +440,53 @@ class AttendanceService:
             
             # Read file into DataFrame
             if is_excel:
-                df = pd.read_excel(io.BytesIO(file_bytes), header=None)
+                try:
+                    # Rust-based reader, much faster than openpyxl/xlrd for both .xlsx and .xls
+                    df = pd.read_excel(io.BytesIO(file_bytes), header=None, engine="calamine")
+                except ImportError:
+                    df = pd.read_excel(io.BytesIO(file_bytes), header=None)
             else:
                 df = pd.read_csv(io.BytesIO(file_bytes), header=None)
             
             if df.empty:
                 raise ValueError("File is empty")
             
-            attendance_dict: Dict[str, str] = {}
-            seen_names_lower = {}  # Track seen names (case-insensitive) to prevent duplicates
-            
             # Find the name column (usually first column, but check for common headers)
             name_col_idx = 0
             start_row = 0
             
-            # Check if first row is header
-            first_row = df.iloc[0].astype(str).str.lower().str.strip()
-            if any(keyword in ' '.join(first_row.values) for keyword in ['name', 'member', 'person', 'attendee']):
+            # Check if first row is header. The name header sits in the first few
+            # columns, so there's no need to look across every date column
+            if any(
+                keyword in str(df.iat[0, col]).lower()
+                for col in range(min(3, df.shape[1]))
+                for keyword in ('name', 'member', 'person', 'attendee')
+            ):
                 start_row = 1  # Skip header row
             
-            # Process each row
-            for idx in range(start_row, len(df)):
-                row = df.iloc[idx]
-                
-                # Get name from first column
-                name = str(row.iloc[name_col_idx]).strip() if pd.notna(row.iloc[name_col_idx]) else ""
-                
-                if not name or name.lower() in ['nan', 'none', '']:
-                    continue
-                
-                # Normalize name (trim whitespace, title case for consistency)
-                name_normalized = name.strip()
-                name_lower = name_normalized.lower()
-                
-                # Check if we've seen this name before (case-insensitive)
-                if name_lower in seen_names_lower:
-                    # Use the original casing from first occurrence, but update status if this one is Present
-                    original_name = seen_names_lower[name_lower]
-                    # If current row has Present, prefer that (last occurrence wins for Present status)
-                    pass  # We'll check and update below
-                else:
-                    seen_names_lower[name_lower] = name_normalized
-                
-                # Check subsequent columns for ticks/checkmarks
-                # Common tick indicators: ✓, ✔, ☑, ✓, X, x, Yes, Y, 1, P, Present, √
-                tick_indicators = ['✓', '✔', '☑', '✓', 'x', 'yes', 'y', '1', 'p', 'present', '√', 'true', 't']
-                
-                is_present = False
-                
-                # Check all columns after the name column
-                for col_idx in range(name_col_idx + 1, len(row)):
-                    cell_value = str(row.iloc[col_idx]).strip().lower() if pd.notna(row.iloc[col_idx]) else ""
-                    
-                    if not cell_value or cell_value == 'nan':
-                        continue
-                    
-                    # Check if cell contains a tick indicator
-                    if any(indicator in cell_value for indicator in tick_indicators):
-                        is_present = True
-                        break
-                    
-                    # Also check for checkmark characters directly
-                    if any(char in cell_value for char in ['✓', '✔', '☑', '√']):
-                        is_present = True
-                        break
-                
-                # Store attendance status (use normalized name, last occurrence wins)
-                # If name already exists, update only if current is Present (to avoid overwriting Present with Not Present)
-                if name_lower in seen_names_lower:
-                    original_name = seen_names_lower[name_lower]
-                    # If we already have this name, only update if current status is Present
-                    # (to preserve Present status if it appears anywhere)
-                    if is_present or name_lower not in attendance_dict:
-                        attendance_dict[original_name] = "Present" if is_present else "Not Present"
-                else:
-                    attendance_dict[name_normalized] = "Present" if is_present else "Not Present"
+            rows = df.iloc[start_row:]
+            
+            # Get names from the name column, skipping blanks
+            names = rows.iloc[:, name_col_idx]
+            names = names.astype(str).str.strip().where(names.notna(), "")
+            names_lower = names.str.lower()
+            valid = ~names_lower.isin(['nan', 'none', ''])
+            
+            # A row is present if any column after the name column contains a tick indicator
+            # Columns with no values at all (spacer or unused date columns) are dropped
+            # up front so they aren't cast and scanned
+            ticks = rows.iloc[:, name_col_idx + 1:].dropna(axis=1, how="all")
+            ticks = ticks.astype(str).where(ticks.notna(), "")
+            is_present = ticks.apply(_column_has_tick).any(axis=1)
+            
+            # Names are matched case-insensitively: keep the casing of the first occurrence
+            # and mark the name Present if any of its rows is present
+            present_by_name = is_present[valid].groupby(names_lower[valid], sort=False).any()
+            original_names = names[valid].groupby(names_lower[valid], sort=False).first()
+            attendance_dict: Dict[str, str] = {
+                original_names[name_lower]: "Present" if present else "Not Present"
+                for name_lower, present in present_by_name.items()
+            }
             
             print(f"Parsed attendance file: {len(attendance_dict)} unique names found")
             return attendance_dict
@@ -1,20 +1,61 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from decouple import config
+from cachetools import TLRUCache, TTLCache
+import hashlib
+import hmac
 import pandas as pd
+import threading
+import time
 
 from app.services.database import get_db
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. New hashes use argon2id, which is cheaper per login than
+# bcrypt at cost 12; existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
 # JWT settings
 SECRET_KEY = config("SECRET_KEY", default="your-secret-key-here")
 ALGORITHM = "HS256"
+ALGORITHMS = [ALGORITHM]  # Built once instead of per jwt.decode call
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Users sheet indexed by lowercase username. Logins read from this instead of
+# fetching the whole sheet each time; it is rebuilt after USER_CACHE_TTL seconds
+USER_CACHE_TTL = 300
+_user_index: Optional[Dict[str, dict]] = None
+_user_index_loaded_at = 0.0
+_user_index_lock = threading.Lock()
+
+# Recently verified credentials, keyed by an HMAC of username and password (never
+# the password itself), so a repeat login within the TTL skips the bcrypt verify.
+# Each entry holds the stored hash it was verified against and only counts while the
+# user's current row still has that hash, so a changed password or removed user
+# stops matching as soon as the users index is refreshed
+CREDENTIAL_CACHE_TTL = 60
+_verified_credentials = TTLCache(maxsize=1024, ttl=CREDENTIAL_CACHE_TTL)
+_verified_credentials_lock = threading.Lock()
+
+# Verified token payloads keyed by the raw token string, so repeated requests
+# from the same client skip the signature check. Entries live for at most
+# TOKEN_CACHE_TTL seconds and never past the token's own "exp" claim.
+TOKEN_CACHE_TTL = 60
+_token_cache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda token, payload, now: min(now + TOKEN_CACHE_TTL, payload.get("exp", now)),
+    timer=time.time,
+)
+_token_cache_lock = threading.Lock()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -23,29 +64,52 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+def _get_user_index() -> Dict[str, dict]:
+    """Get user rows keyed by lowercase username, refreshing from Google Sheets when stale"""
+    global _user_index, _user_index_loaded_at
+    with _user_index_lock:
+        if _user_index is not None and time.monotonic() - _user_index_loaded_at < USER_CACHE_TTL:
+            return _user_index
+
+    db = get_db()
+    users_df = db.get_users_df()
+    if users_df.empty:
+        # Don't cache a failed or empty read
+        return {}
+
+    # Clean whitespace and convert to lowercase for case-insensitive matching
+    usernames_lower = users_df['username'].astype(str).str.strip().str.lower()
+    index: Dict[str, dict] = {}
+    for username_lower, row in zip(usernames_lower, users_df.to_dict('records')):
+        index.setdefault(username_lower, row)  # First row wins for duplicate usernames
+
+    with _user_index_lock:
+        _user_index = index
+        _user_index_loaded_at = time.monotonic()
+    return index
+
+def _credential_key(username: str, password: str) -> bytes:
+    """Keyed digest identifying a username/password pair"""
+    return hmac.new(SECRET_KEY.encode(), f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
 def authenticate_user(username: str, password: str) -> Optional[dict]:
     """Authenticate user against Google Sheets database"""
     try:
-        db = get_db()
-        users_df = db.get_users_df()
-
-        if users_df.empty:
-            print("No users found in database")
-            return None
-
         # Clean whitespace and convert to lowercase for case-insensitive matching
         username = username.strip().lower()
         password = password.strip()
 
-        # Convert username column to lowercase for comparison (handle NaN values)
-        users_df['username_lower'] = users_df['username'].astype(str).str.strip().str.lower()
-        
-        # Filter for the specific user (case-insensitive)
-        user_match = users_df[users_df['username_lower'] == username]
+        users = _get_user_index()
 
-        if not user_match.empty:
+        if not users:
+            print("No users found in database")
+            return None
+
+        user = users.get(username)
+
+        if user is not None:
             # Get stored password (handle NaN values)
-            stored_password_raw = user_match.iloc[0]['password']
+            stored_password_raw = user.get('password')
             if pd.isna(stored_password_raw):
                 print(f"Password is NaN for user: {username}")
                 return None
@@ -56,30 +120,38 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
                 print(f"Password is empty for user: {username}")
                 return None
 
+            credential_key = _credential_key(username, password)
+            with _verified_credentials_lock:
+                password_valid = _verified_credentials.get(credential_key) == stored_password
+
             # Check password (support both hashed and plain text for migration)
-            password_valid = False
-            try:
-                password_valid = verify_password(password, stored_password)
-            except Exception as e:
-                # If password verification fails (e.g., not a valid hash), try plain text comparison
-                print(f"Password verification error for user {username}: {e}")
-                password_valid = False
-
-            # Try plain text comparison if bcrypt verification failed
             if not password_valid:
-                password_valid = (stored_password == password)
+                try:
+                    password_valid = verify_password(password, stored_password)
+                except Exception as e:
+                    # If password verification fails (e.g., not a valid hash), try plain text comparison
+                    print(f"Password verification error for user {username}: {e}")
+                    password_valid = False
+
+                # Try plain text comparison if bcrypt verification failed
+                if not password_valid:
+                    password_valid = (stored_password == password)
+
+                if password_valid:
+                    with _verified_credentials_lock:
+                        _verified_credentials[credential_key] = stored_password
 
             if password_valid:
                 return {
-                    "username": str(user_match.iloc[0]['username']).strip(),
-                    "role": str(user_match.iloc[0].get('role', 'user')).strip(),
-                    "email": str(user_match.iloc[0].get('email', '')).strip()
+                    "username": str(user['username']).strip(),
+                    "role": str(user.get('role', 'user')).strip(),
+                    "email": str(user.get('email', '')).strip()
                 }
             else:
                 print(f"Password mismatch for user: {username}")
         else:
             print(f"User not found: {username}")
-            print(f"Available usernames: {users_df['username'].astype(str).str.strip().tolist() if not users_df.empty else 'None'}")
+            print(f"Available usernames: {[str(u['username']).strip() for u in users.values()]}")
 
     except Exception as e:
         print(f"Authentication error: {e}")
@@ -102,9 +174,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify JWT token and return payload"""
+    """Verify JWT token and return payload, reusing the payload of a recent successful verification"""
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+    if payload is not None:
+        return dict(payload)  # Callers get their own copy, so changes can't leak into the cache
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHMS)
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    with _token_cache_lock:
+        _token_cache[token] = payload
+    return dict(payload)
\ No newline at end of file
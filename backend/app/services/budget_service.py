@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
 import io
-import xlsxwriter
+import re
 from datetime import date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Union
 from pydantic import BaseModel
+from app.utils.dates import format_event_date
 
 class BudgetItem(BaseModel):
     description: str
@@ -21,56 +23,107 @@ class BudgetRequest(BaseModel):
     designation: str
     vetted_by: str
 
+# Budget workbook layout. Format specs are plain dicts; Format objects belong to a
+# workbook, so add_format still runs per workbook
+_FMT_TITLE = {'font_name': 'Calibri', 'font_size': 14, 'bold': True, 'align': 'center'}
+_FMT_BOLD = {'font_name': 'Calibri', 'font_size': 11, 'bold': True}
+_FMT_BOLD_CENTER = {'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'align': 'center'}
+_FMT_HEADER = {'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'border': 1, 'align': 'center', 'bg_color': '#D9D9D9'}
+_FMT_TEXT = {'font_name': 'Calibri', 'font_size': 11, 'border': 1}
+_FMT_CURRENCY = {'font_name': 'Calibri', 'font_size': 11, 'border': 1, 'num_format': '$#,##0.00'}
+_FMT_CURR_BOLD = {'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'num_format': '$#,##0.00'}
+_COLUMN_WIDTHS = (
+    ('A:A', 30), ('E:E', 30),
+    ('B:B', 12), ('F:F', 12),
+    ('C:C', 8), ('G:G', 8),
+    ('D:D', 12), ('H:H', 12),
+)
+_TABLE_HEADERS = ("Description", "$ per unit", "Qty", "$")
+_ORG_NAME = "Teck Ghee Youth Network"
+_SIGNATURE_LINE = "_" * 25
+_SIGNATURE_COLUMNS = (0, 4)
+_PARTICIPANTS_RE = re.compile(r"Participants:\s*(\d+)")
+_VOLUNTEERS_RE = re.compile(r"Volunteers:\s*(\d+)")
+
+def _to_number(value: Any) -> Union[int, float]:
+    """Coerce an item value to a number, like pd.to_numeric(errors='coerce').fillna(0)"""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                return 0
+    if not isinstance(value, (int, float)) or value != value:  # None, other types, NaN
+        return 0
+    return value
+
 class BudgetService:
     @staticmethod
     def calculate_budget_totals(df: pd.DataFrame) -> pd.DataFrame:
         """Calculate totals for budget items"""
-        df["$ per unit"] = pd.to_numeric(df["$ per unit"], errors='coerce').fillna(0)
-        df["Qty"] = pd.to_numeric(df["Qty"], errors='coerce').fillna(0)
-        df["$ (Total)"] = df["$ per unit"] * df["Qty"]
+        # to_numeric on the raw arrays returns fresh ndarrays, so NaNs can be zeroed
+        # in place instead of allocating intermediate Series with fillna
+        per_unit = pd.to_numeric(df["$ per unit"].to_numpy(), errors='coerce')
+        qty = pd.to_numeric(df["Qty"].to_numpy(), errors='coerce')
+        np.nan_to_num(per_unit, copy=False)
+        np.nan_to_num(qty, copy=False)
+        df["$ per unit"] = per_unit
+        df["Qty"] = qty
+        df["$ (Total)"] = np.multiply(per_unit, qty, dtype=np.float64)
         return df
 
+    @staticmethod
+    def calculate_item_totals(items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], float]:
+        """Calculate totals for budget items without building a DataFrame.
+
+        Returns copies of the items with numeric "$ per unit"/"Qty" and a "$ (Total)"
+        value, plus the sum of all totals.
+        """
+        rows = []
+        total = 0.0
+        for item in items:
+            per_unit = _to_number(item.get("$ per unit"))
+            qty = _to_number(item.get("Qty"))
+            line_total = float(per_unit) * float(qty)
+            rows.append({**item, "$ per unit": per_unit, "Qty": qty, "$ (Total)": line_total})
+            total += line_total
+        return rows, total
+
     @staticmethod
     def generate_budget_excel(request: BudgetRequest) -> bytes:
         """Generate budget Excel file"""
+        # Imported lazily: only the budget export endpoints need xlsxwriter
+        import xlsxwriter
+
         output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        # constant_memory flushes each row once a later row is started, so peak
+        # memory stays flat; every row below must be written in increasing order
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
         sheet = workbook.add_worksheet("Budget")
 
-        # Convert items to DataFrames
-        income_df = pd.DataFrame(request.income_items)
-        expense_df = pd.DataFrame(request.expense_items)
-
-        # Calculate totals
-        if not income_df.empty:
-            income_df = BudgetService.calculate_budget_totals(income_df)
-        if not expense_df.empty:
-            expense_df = BudgetService.calculate_budget_totals(expense_df)
+        # Calculate totals. Budgets have a few dozen items at most, so plain Python
+        # beats building and computing over DataFrames here
+        income_items, income_total = BudgetService.calculate_item_totals(request.income_items)
+        expense_items, expense_total = BudgetService.calculate_item_totals(request.expense_items)
 
         # Styles
-        fmt_title = workbook.add_format({'font_name': 'Calibri', 'font_size': 14, 'bold': True, 'align': 'center'})
-        fmt_bold = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'bold': True})
-        fmt_bold_center = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'align': 'center'})
-        fmt_header = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'bold': True, 'border': 1, 'align': 'center', 'bg_color': '#D9D9D9'})
-        fmt_text = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'border': 1})
-        fmt_currency = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'border': 1, 'num_format': '$#,##0.00'})
-        fmt_curr_bold = workbook.add_format({'font_name': 'Calibri', 'font_size': 11, 'bold':True, 'num_format': '$#,##0.00'})
+        fmt_title = workbook.add_format(_FMT_TITLE)
+        fmt_bold = workbook.add_format(_FMT_BOLD)
+        fmt_bold_center = workbook.add_format(_FMT_BOLD_CENTER)
+        fmt_header = workbook.add_format(_FMT_HEADER)
+        fmt_text = workbook.add_format(_FMT_TEXT)
+        fmt_currency = workbook.add_format(_FMT_CURRENCY)
+        fmt_curr_bold = workbook.add_format(_FMT_CURR_BOLD)
 
         # Columns
-        sheet.set_column('A:A', 30); sheet.set_column('E:E', 30)
-        sheet.set_column('B:B', 12); sheet.set_column('F:F', 12)
-        sheet.set_column('C:C', 8);  sheet.set_column('G:G', 8)
-        sheet.set_column('D:D', 12); sheet.set_column('H:H', 12)
+        for columns, width in _COLUMN_WIDTHS:
+            sheet.set_column(columns, width)
 
         # Header
-        sheet.merge_range('A1:H1', "Teck Ghee Youth Network", fmt_title)
-        # Parse date string to format it
-        from datetime import datetime
-        try:
-            parsed_date = datetime.fromisoformat(request.event_date.replace('T', ' ').split('.')[0])
-            formatted_date = parsed_date.strftime('%d-%b-%y')
-        except:
-            formatted_date = request.event_date  # fallback to original string
+        sheet.merge_range('A1:H1', _ORG_NAME, fmt_title)
+        formatted_date = format_event_date(request.event_date)
         sheet.merge_range('A2:H2', formatted_date, fmt_bold_center)
         sheet.merge_range('A3:H3', request.event_name, fmt_bold_center)
         sheet.merge_range('A4:H4', "Projected Statement of Accounts", fmt_bold_center)
@@ -81,67 +134,65 @@ class BudgetService:
         sheet.write(8, 0, "INCOME", fmt_bold)
         sheet.write(8, 4, "EXPENDITURE", fmt_bold)
 
-        headers = ["Description", "$ per unit", "Qty", "$"]
-        for i, h in enumerate(headers):
+        for i, h in enumerate(_TABLE_HEADERS):
             sheet.write(9, i, h, fmt_header)
             sheet.write(9, 4 + i, h, fmt_header)
 
         # Data
-        rows = max(len(income_df), len(expense_df), 17)
-        for i in range(rows):
+        income_rows = [(item.get('Description'), item['$ per unit'], item['Qty'], item['$ (Total)']) for item in income_items]
+        expense_rows = [(item.get('Description'), item['$ per unit'], item['Qty'], item['$ (Total)']) for item in expense_items]
+
+        # Both tables are padded with blank bordered rows to the same length (at least 17)
+        rows = max(len(income_rows), len(expense_rows), 17)
+        income_rows += [None] * (rows - len(income_rows))
+        expense_rows += [None] * (rows - len(expense_rows))
+
+        def write_item_row(r: int, col: int, item: Any) -> None:
+            if item is None:
+                # write_blank skips write()'s type dispatch for the formatted padding cells
+                for c in range(col, col + 4):
+                    sheet.write_blank(r, c, None, fmt_text)
+                return
+            description, per_unit, qty, total = item
+            sheet.write(r, col, description, fmt_text)
+            sheet.write_number(r, col + 1, per_unit, fmt_currency)
+            sheet.write_number(r, col + 2, qty, fmt_text)
+            sheet.write_number(r, col + 3, total, fmt_currency)
+
+        for i, (income_item, expense_item) in enumerate(zip(income_rows, expense_rows)):
             r = 10 + i
-            # Income
-            if i < len(income_df):
-                row = income_df.iloc[i]
-                sheet.write(r, 0, row['Description'], fmt_text)
-                sheet.write(r, 1, row['$ per unit'], fmt_currency)
-                sheet.write(r, 2, row['Qty'], fmt_text)
-                sheet.write(r, 3, row['$ (Total)'], fmt_currency)
-            else:
-                for c in range(4): sheet.write(r, c, "", fmt_text)
-            # Expenditure
-            if i < len(expense_df):
-                row = expense_df.iloc[i]
-                sheet.write(r, 4, row['Description'], fmt_text)
-                sheet.write(r, 5, row['$ per unit'], fmt_currency)
-                sheet.write(r, 6, row['Qty'], fmt_text)
-                sheet.write(r, 7, row['$ (Total)'], fmt_currency)
-            else:
-                for c in range(4, 8): sheet.write(r, c, "", fmt_text)
+            write_item_row(r, 0, income_item)  # Income
+            write_item_row(r, 4, expense_item)  # Expenditure
 
         # Totals
         r_tot = 10 + rows
-        if not income_df.empty:
+        if income_items:
             sheet.write(r_tot, 0, "Total Income:", fmt_bold)
-            sheet.write(r_tot, 3, income_df["$ (Total)"].sum(), fmt_curr_bold)
-        if not expense_df.empty:
+            sheet.write(r_tot, 3, income_total, fmt_curr_bold)
+        if expense_items:
             sheet.write(r_tot, 4, "Total Expenditure:", fmt_bold)
-            sheet.write(r_tot, 7, expense_df["$ (Total)"].sum(), fmt_curr_bold)
+            sheet.write(r_tot, 7, expense_total, fmt_curr_bold)
 
         # Net calculation
-        income_total = income_df["$ (Total)"].sum() if not income_df.empty else 0
-        expense_total = expense_df["$ (Total)"].sum() if not expense_df.empty else 0
         net = income_total - expense_total
 
         sheet.write(r_tot+2, 4, "Deficit/Surplus:", fmt_bold)
         sheet.write(r_tot+2, 7, net, fmt_curr_bold)
 
-        # Signatures
+        # Signatures: Prepared By (column A) and Vetted By (column E) side by side,
+        # written row by row to keep the constant_memory ordering
         r_sig = r_tot + 5
-        # Prepared By
-        sheet.write(r_sig, 0, "_"*25); sheet.write(r_sig+1, 0, "Prepared By:")
-        sheet.write(r_sig+2, 0, request.prepared_by); sheet.write(r_sig+3, 0, request.designation)
-        sheet.write(r_sig+4, 0, "Teck Ghee Youth Network")
-        # Vetted By
-        sheet.write(r_sig, 4, "_"*25); sheet.write(r_sig+1, 4, "Vetted By:")
-        sheet.write(r_sig+2, 4, request.vetted_by); sheet.write(r_sig+3, 4, "Member")
-        sheet.write(r_sig+4, 4, "Teck Ghee Youth Network")
+        prepared = [_SIGNATURE_LINE, "Prepared By:", request.prepared_by, request.designation, _ORG_NAME]
+        vetted = [_SIGNATURE_LINE, "Vetted By:", request.vetted_by, "Member", _ORG_NAME]
+        for offset, (prepared_line, vetted_line) in enumerate(zip(prepared, vetted)):
+            sheet.write(r_sig + offset, 0, prepared_line)
+            sheet.write(r_sig + offset, 4, vetted_line)
 
         # Approved By
         r_app = r_sig + 6
-        sheet.write(r_app, 4, "_"*25); sheet.write(r_app+1, 4, "Approved By:")
+        sheet.write(r_app, 4, _SIGNATURE_LINE); sheet.write(r_app+1, 4, "Approved By:")
         sheet.write(r_app+2, 4, "[Name]"); sheet.write(r_app+3, 4, "Chairman/Treasurer")
-        sheet.write(r_app+4, 4, "Teck Ghee Youth Network")
+        sheet.write(r_app+4, 4, _ORG_NAME)
 
         workbook.close()
         return output.getvalue()
@@ -149,8 +200,6 @@ class BudgetService:
     @staticmethod
     def parse_budget_excel(file_bytes: bytes) -> Dict[str, Any]:
         """Parse an existing budget Excel file generated by this system into a BudgetRequest-like dict."""
-        from io import BytesIO
-
         result: Dict[str, Any] = {
             "event_name": "",
             "event_date": "",
@@ -163,100 +212,105 @@ class BudgetService:
             "expense_items": [],
         }
 
+        # Stream the rows once in read-only mode instead of loading a DataFrame and
+        # scanning it several times
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
         try:
-            df = pd.read_excel(BytesIO(file_bytes), sheet_name="Budget", header=None)
-        except Exception:
             # Fallback: try first sheet name
-            df = pd.read_excel(BytesIO(file_bytes), header=None)
-
-        # Event name: line with non-empty text between title and "Projected Statement of Accounts"
-        for _, row in df.iterrows():
-            val = row.iloc[0]
-            if isinstance(val, str) and val.strip() and "Teck Ghee Youth Network" not in val and "Projected Statement of Accounts" not in val and "No. of Expected Participants" not in val:
-                result["event_name"] = val.strip()
-                break
-
-        # Event date: look for row that contains "No. of Expected Participants" and also use the earlier date row if available
-        for _, row in df.iterrows():
-            val = row.iloc[0]
-            if isinstance(val, str) and "No. of Expected Participants" in val:
-                # Try to extract participants and volunteers
-                text = val
-                import re
-
-                m = re.search(r"Participants:\s*(\d+)", text)
-                if m:
-                    result["participants"] = int(m.group(1))
-                m = re.search(r"Volunteers:\s*(\d+)", text)
-                if m:
-                    result["volunteers"] = int(m.group(1))
-                break
-
-        # Prepared By / Designation / Vetted By
-        mask_prepared = df == "Prepared By:"
-        coords_prepared = list(zip(*mask_prepared.to_numpy().nonzero()))
-        if coords_prepared:
-            r, c = coords_prepared[0]
-            if r + 2 < len(df):
-                result["prepared_by"] = str(df.iat[r + 2, c] or "").strip()
-                result["designation"] = str(df.iat[r + 3, c] or "").strip()
-
-        mask_vetted = df == "Vetted By:"
-        coords_vetted = list(zip(*mask_vetted.to_numpy().nonzero()))
-        if coords_vetted:
-            r, c = coords_vetted[0]
-            if r + 2 < len(df.columns):
-                result["vetted_by"] = str(df.iat[r + 2, c] or "").strip()
-
-        # Find header row for income/expense tables
-        header_row_idx = None
-        for idx, row in df.iterrows():
-            if (
-                str(row.iloc[0]).strip() == "Description"
-                and str(row.iloc[1]).strip() == "$ per unit"
-            ):
-                header_row_idx = idx
-                break
-
-        income_items: List[Dict[str, Any]] = []
-        expense_items: List[Dict[str, Any]] = []
-
-        if header_row_idx is not None:
-            # Income in cols 0-3, Expenditure in cols 4-7
-            i = header_row_idx + 1
-            while i < len(df):
-                row = df.iloc[i]
-                # Stop at Total row
-                if isinstance(row.iloc[0], str) and row.iloc[0].strip().startswith("Total Income"):
-                    break
-
-                desc = row.iloc[0]
-                if not (pd.isna(desc) and pd.isna(row.iloc[1]) and pd.isna(row.iloc[2]) and pd.isna(row.iloc[3])):
-                    if isinstance(desc, str) and desc.strip():
-                        income_items.append(
-                            {
-                                "Description": str(desc).strip(),
-                                "$ per unit": float(row.iloc[1] or 0),
-                                "Qty": int(row.iloc[2] or 0),
-                                "$ (Total)": float(row.iloc[3] or 0),
-                            }
-                        )
-
-                exp_desc = row.iloc[4] if len(row) > 4 else None
-                if len(row) > 7 and not (pd.isna(exp_desc) and pd.isna(row.iloc[5]) and pd.isna(row.iloc[6]) and pd.isna(row.iloc[7])):
-                    if isinstance(exp_desc, str) and exp_desc.strip():
-                        expense_items.append(
-                            {
-                                "Description": str(exp_desc).strip(),
-                                "$ per unit": float(row.iloc[5] or 0),
-                                "Qty": int(row.iloc[6] or 0),
-                                "$ (Total)": float(row.iloc[7] or 0),
-                            }
-                        )
-
-                i += 1
+            sheet = workbook["Budget"] if "Budget" in workbook.sheetnames else workbook.worksheets[0]
+            n_cols = sheet.max_column or 0
+
+            income_items: List[Dict[str, Any]] = []
+            expense_items: List[Dict[str, Any]] = []
+
+            found_event_name = False
+            found_participants = False
+            prepared_at = None  # (row, col) of the "Prepared By:" label
+            vetted_at = None  # (row, col) of the "Vetted By:" label
+            in_items = False  # Between the table header row and the totals row
+            items_done = False
+
+            for r, row in enumerate(sheet.iter_rows(values_only=True)):
+                if len(row) < 8:
+                    row = row + (None,) * (8 - len(row))
+                first = row[0]
+
+                # Event name: line with non-empty text between title and "Projected Statement of Accounts"
+                if not found_event_name and isinstance(first, str) and first.strip() and "Teck Ghee Youth Network" not in first and "Projected Statement of Accounts" not in first and "No. of Expected Participants" not in first:
+                    result["event_name"] = first.strip()
+                    found_event_name = True
+
+                # Participants and volunteers from the "No. of Expected Participants" row
+                if not found_participants and isinstance(first, str) and "No. of Expected Participants" in first:
+                    m = _PARTICIPANTS_RE.search(first)
+                    if m:
+                        result["participants"] = int(m.group(1))
+                    m = _VOLUNTEERS_RE.search(first)
+                    if m:
+                        result["volunteers"] = int(m.group(1))
+                    found_participants = True
+
+                # Prepared By / Designation / Vetted By, read relative to their labels.
+                # The signature blocks sit in columns A and E, so only those are checked
+                if prepared_at is None or vetted_at is None:
+                    for c in _SIGNATURE_COLUMNS:
+                        val = row[c]
+                        if prepared_at is None and val == "Prepared By:":
+                            prepared_at = (r, c)
+                        elif vetted_at is None and val == "Vetted By:":
+                            vetted_at = (r, c)
+                if prepared_at is not None:
+                    if r == prepared_at[0] + 2:
+                        result["prepared_by"] = str(row[prepared_at[1]] or "").strip()
+                    elif r == prepared_at[0] + 3:
+                        result["designation"] = str(row[prepared_at[1]] or "").strip()
+                if vetted_at is not None and vetted_at[0] + 2 < n_cols and r == vetted_at[0] + 2:
+                    result["vetted_by"] = str(row[vetted_at[1]] or "").strip()
+
+                if items_done:
+                    continue
+
+                # Find header row for income/expense tables
+                if not in_items:
+                    if str(first).strip() == "Description" and str(row[1]).strip() == "$ per unit":
+                        in_items = True
+                    continue
+
+                # Stop at the totals row. Only the non-empty table gets a total, so
+                # check both sides
+                if (isinstance(first, str) and first.strip().startswith("Total Income")) or (
+                    isinstance(row[4], str) and row[4].strip().startswith("Total Expenditure")
+                ):
+                    items_done = True
+                    continue
+
+                # Income in cols 0-3, Expenditure in cols 4-7
+                if isinstance(first, str) and first.strip():
+                    income_items.append(
+                        {
+                            "Description": first.strip(),
+                            "$ per unit": float(row[1] or 0),
+                            "Qty": int(row[2] or 0),
+                            "$ (Total)": float(row[3] or 0),
+                        }
+                    )
+
+                exp_desc = row[4]
+                if isinstance(exp_desc, str) and exp_desc.strip():
+                    expense_items.append(
+                        {
+                            "Description": exp_desc.strip(),
+                            "$ per unit": float(row[5] or 0),
+                            "Qty": int(row[6] or 0),
+                            "$ (Total)": float(row[7] or 0),
+                        }
+                    )
+        finally:
+            workbook.close()
 
         result["income_items"] = income_items
         result["expense_items"] = expense_items
 
-        return result
\ No newline at end of file
+        return result
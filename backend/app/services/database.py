@@ -1,168 +1,341 @@
 import gspread
+from concurrent.futures import ThreadPoolExecutor
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from gspread.utils import absolute_range_name
+from fastapi.concurrency import run_in_threadpool
+from requests import Response
+from requests.adapters import HTTPAdapter
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
 import pandas as pd
-import json
-from typing import Optional, Dict, Any
+import functools
+import logging
+import orjson
+import random
+import threading
+import time
+from cachetools import TTLCache
+from typing import Optional, Dict, Any, List, Tuple
 from app.utils.config import get_google_sheets_url, get_google_service_account_file
 import os
 
+logger = logging.getLogger(__name__)
+
+# Worksheet reads are memoized for this many seconds; saves through this class drop the
+# entry in the saving process only
+WORKSHEET_CACHE_TTL = 30
+# Cells are read unformatted (real JSON numbers/booleans, no server-side display
+# formatting), the way get_all_records used to numericise them; dates still come back
+# as their formatted strings rather than serial numbers. gspread adds to the params
+# dict it is given, so pass a copy
+_READ_PARAMS = {"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"}
+# Rows per batchUpdate when saving a worksheet; the Sheets API caps request size
+SAVE_CHUNK_ROWS = 10_000
+
+def _cell_data(value: Any) -> Dict[str, Any]:
+    """CellData for a raw value, stored as-is like RAW value input"""
+    if value is None or (isinstance(value, float) and value != value):  # None or NaN -> empty cell
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+class RetryingHTTPClient(HTTPClient):
+    """gspread HTTP client that retries rate-limited (429) and transient server
+    errors with jittered exponential backoff, honouring Retry-After when sent.
+    Unlike gspread's BackOffHTTPClient, the attempt count is per call, so it is
+    safe to share between threads. The waits block the calling thread, so call
+    it from the threadpool, never from the event loop.
+
+    Only reads are retried on timeouts and server errors; a write that failed that
+    way may still have been applied (e.g. a batchUpdate appending rows), so writes
+    are retried only when rate limited, which means the request was rejected."""
+
+    RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+    WRITE_RETRY_STATUS_CODES = frozenset({429})
+    MAX_ATTEMPTS = 5
+    MAX_WAIT = 30.0
+
+    def request(self, method: str, *args: Any, **kwargs: Any) -> Response:
+        retry_codes = self.RETRY_STATUS_CODES if method.lower() == "get" else self.WRITE_RETRY_STATUS_CODES
+        body = kwargs.pop("json", None)
+        if body is not None:
+            # Encode JSON bodies (e.g. save_worksheet_data's batchUpdate) with orjson
+            # instead of letting requests run them through the stdlib encoder
+            kwargs["data"] = orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return super().request(method, *args, **kwargs)
+            except APIError as e:
+                if attempt == self.MAX_ATTEMPTS or e.code not in retry_codes:
+                    raise
+                retry_after = e.response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    wait = min(float(retry_after), self.MAX_WAIT)
+                else:
+                    wait = random.uniform(0, min(self.MAX_WAIT, 0.5 * 2 ** attempt))
+                logger.warning("Sheets API returned %s, retrying in %.1fs (attempt %d)", e.code, wait, attempt)
+                time.sleep(wait)
+
+@functools.lru_cache(maxsize=4)
+def get_sheets_client(creds_file_path: str) -> gspread.Client:
+    """Authorized gspread client for a service account file, built once per path;
+    google-auth refreshes the token as needed"""
+    with open(creds_file_path, 'rb') as f:
+        creds_dict = orjson.loads(f.read())
+
+    creds = Credentials.from_service_account_info(
+        creds_dict,
+        scopes=[
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+    )
+    # gspread's default session keeps urllib3's pool of 10 connections; the
+    # threadpool fan-outs issue more concurrent requests than that, so size the pool
+    # up to keep connections (and their TLS sessions) alive for reuse
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount('https://', adapter)
+    return gspread.authorize(creds, http_client=RetryingHTTPClient, session=session)
+
 class GoogleSheetsDB:
     def __init__(self):
         self.gc = None
         self.spreadsheet = None
         self.initialized = False
         self.error_message = None
+        # Worksheet handles by name; spreadsheet.worksheet() costs a metadata request each call
+        self._ws_cache: Dict[str, gspread.Worksheet] = {}
+        # Recently read worksheet DataFrames by name
+        self._data_cache = TTLCache(maxsize=32, ttl=WORKSHEET_CACHE_TTL)
+        self._data_cache_lock = threading.Lock()
         self._initialize_connection()
 
     def _initialize_connection(self):
         """Initialize Google Sheets connection"""
         try:
             # Get path to the Google service account JSON file
-            # Try multiple possible locations
-            possible_paths = [
-                "/Users/nathanielneo/Desktop/Projects/TGYN_Admin/tgyn-admin-1452dbad90f6.json",  # Absolute path (updated)
-                "/Users/nathanielneo/Desktop/TGYN_Admin/tgyn-admin-1452dbad90f6.json",  # Legacy path
-                "./tgyn-admin-1452dbad90f6.json",  # Relative to current directory
-                "../tgyn-admin-1452dbad90f6.json",  # Relative to backend directory
-                "../../tgyn-admin-1452dbad90f6.json",  # From backend/app/services
-            ]
-
-            creds_file_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    creds_file_path = path
-                    print(f"Found Google service account file at: {path}")
-                    break
-
-            if not creds_file_path:
-                error_msg = f"Google service account JSON file not found. Searched in: {', '.join(possible_paths)}"
-                print(f"ERROR: {error_msg}")
+            creds_file_path = get_google_service_account_file()
+            if not os.path.exists(creds_file_path):
+                error_msg = f"Google service account JSON file not found at {creds_file_path}"
+                logger.error(error_msg)
                 self.error_message = error_msg
                 return
+            logger.info("Found Google service account file at: %s", creds_file_path)
 
-            # Load credentials from JSON file
-            with open(creds_file_path, 'r') as f:
-                creds_dict = json.load(f)
-
-            creds = Credentials.from_service_account_info(
-                creds_dict,
-                scopes=[
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-            )
-
-            self.gc = gspread.authorize(creds)
-            print("Google Sheets client authorized successfully")
+            self.gc = get_sheets_client(creds_file_path)
+            logger.info("Google Sheets client authorized successfully")
 
             # Get spreadsheet URL from configuration
             spreadsheet_url = get_google_sheets_url()
             if not spreadsheet_url:
                 error_msg = "Google Sheets URL not configured. Please set it in config.json or GOOGLE_SPREADSHEET_URL environment variable."
-                print(f"ERROR: {error_msg}")
+                logger.error(error_msg)
                 self.error_message = error_msg
                 return
 
             self.spreadsheet = self.gc.open_by_url(spreadsheet_url)
             self.initialized = True
-            print(f"Google Sheets connection established successfully. Spreadsheet: {self.spreadsheet.title}")
+            logger.info("Google Sheets connection established successfully. Spreadsheet: %s", self.spreadsheet.title)
 
         except Exception as e:
             error_msg = f"Failed to initialize Google Sheets connection: {e}"
-            print(f"ERROR: {error_msg}")
+            logger.exception(error_msg)
             self.error_message = error_msg
-            import traceback
-            traceback.print_exc()
+
+    def _ws(self, worksheet_name: str) -> gspread.Worksheet:
+        """Get a worksheet by name, reusing the handle from earlier calls"""
+        worksheet = self._ws_cache.get(worksheet_name)
+        if worksheet is None:
+            worksheet = self.spreadsheet.worksheet(worksheet_name)
+            self._ws_cache[worksheet_name] = worksheet
+        return worksheet
+
+    def _grid_size(self, sheet_id: int) -> Tuple[int, int]:
+        """Current (rows, columns) of a sheet's grid. Read from the API, as cached
+        handles don't see resizes made by batchUpdate or outside the app"""
+        metadata = self.spreadsheet.fetch_sheet_metadata(
+            params={"fields": "sheets.properties(sheetId,gridProperties(rowCount,columnCount))"}
+        )
+        for sheet in metadata.get("sheets", []):
+            properties = sheet["properties"]
+            if properties.get("sheetId", 0) == sheet_id:  # The API may omit a zero sheetId
+                grid = properties["gridProperties"]
+                return grid["rowCount"], grid["columnCount"]
+        raise gspread.exceptions.WorksheetNotFound(sheet_id)
+
+    @staticmethod
+    def _rows_df(rows: List[list]) -> pd.DataFrame:
+        """Build a DataFrame from sheet rows, using the first row as headers"""
+        if not rows:
+            return pd.DataFrame()
+        # The API trims trailing empty cells, so pad ragged rows out to the widest one
+        width = max(map(len, rows))
+        rows = [row + [""] * (width - len(row)) if len(row) < width else row for row in rows]
+        return pd.DataFrame(rows[1:], columns=rows[0])
+
+    def _worksheet_df(self, worksheet_name: str) -> pd.DataFrame:
+        """Load a worksheet into a DataFrame"""
+        # A single values.get by sheet name: no worksheet metadata lookup, and no
+        # per-row dicts like get_all_records would build
+        return self._rows_df(self.spreadsheet.values_get(absolute_range_name(worksheet_name), params=dict(_READ_PARAMS)).get("values", []))
 
     def get_users_df(self) -> pd.DataFrame:
         """Get users data from Google Sheets"""
         if not self.initialized:
-            print("Warning: Cannot get users data - Google Sheets not initialized")
-            return pd.DataFrame()
-        try:
-            worksheet = self.spreadsheet.worksheet("Users")
-            data = worksheet.get_all_records()
-            return pd.DataFrame(data)
-        except Exception as e:
-            print(f"Error getting users data: {e}")
+            logger.warning("Cannot get users data - Google Sheets not initialized")
             return pd.DataFrame()
+        return self.get_worksheet_data("Users")
 
     def get_worksheet_data(self, worksheet_name: str) -> pd.DataFrame:
-        """Get data from a specific worksheet"""
-        try:
-            worksheet = self.spreadsheet.worksheet(worksheet_name)
-            data = worksheet.get_all_records()
-            return pd.DataFrame(data)
-        except Exception as e:
-            print(f"Error getting {worksheet_name} data: {e}")
-            return pd.DataFrame()
+        """Get data from a specific worksheet.
+
+        Reads are cached per process for WORKSHEET_CACHE_TTL seconds. A save only
+        drops the entry in the worker that made it, so other workers can return
+        the previous data for up to that long after a write."""
+        with self._data_cache_lock:
+            df = self._data_cache.get(worksheet_name)
+        if df is None:
+            try:
+                df = self._worksheet_df(worksheet_name)
+            except Exception:
+                logger.exception("Error getting %s data", worksheet_name)
+                return pd.DataFrame()  # Failed reads aren't cached
+            with self._data_cache_lock:
+                self._data_cache[worksheet_name] = df
+        # Callers may modify the frame in place; give them a copy, not the cached one
+        return df.copy()
+
+    def invalidate_worksheet_cache(self, worksheet_name: Optional[str] = None) -> None:
+        """Drop the cached data for one worksheet, or for all of them"""
+        with self._data_cache_lock:
+            if worksheet_name is None:
+                self._data_cache.clear()
+            else:
+                self._data_cache.pop(worksheet_name, None)
 
     def save_worksheet_data(self, worksheet_name: str, df: pd.DataFrame) -> bool:
         """Save DataFrame to a specific worksheet"""
         try:
-            worksheet = self.spreadsheet.worksheet(worksheet_name)
-            # Clear existing data
-            worksheet.clear()
+            worksheet = self._ws(worksheet_name)
             # Convert DataFrame to list of lists
-            data = [df.columns.tolist()] + df.values.tolist()
-            worksheet.update(data)
+            data = [df.columns.tolist()]
+            data.extend(df.to_numpy(dtype=object, copy=False).tolist())
+            n_rows = len(data)
+            n_cols = max(len(row) for row in data)
+
+            # Clear existing data and write the new values in one batchUpdate, instead
+            # of a values.clear call followed by a values.update call. Large frames are
+            # written SAVE_CHUNK_ROWS rows per request to stay under the request size
+            # limit, with the cell payload built one chunk at a time
+            requests = []
+            # updateCells doesn't grow the grid, so add rows/columns first if needed
+            row_count, col_count = self._grid_size(worksheet.id)
+            if n_rows > row_count:
+                requests.append({"appendDimension": {"sheetId": worksheet.id, "dimension": "ROWS", "length": n_rows - row_count}})
+            if n_cols > col_count:
+                requests.append({"appendDimension": {"sheetId": worksheet.id, "dimension": "COLUMNS", "length": n_cols - col_count}})
+            requests.append({"updateCells": {"range": {"sheetId": worksheet.id}, "fields": "userEnteredValue"}})
+            for start in range(0, n_rows, SAVE_CHUNK_ROWS):
+                requests.append({
+                    "updateCells": {
+                        "start": {"sheetId": worksheet.id, "rowIndex": start, "columnIndex": 0},
+                        "rows": [{"values": [_cell_data(value) for value in row]} for row in data[start:start + SAVE_CHUNK_ROWS]],
+                        "fields": "userEnteredValue",
+                    }
+                })
+                self.spreadsheet.batch_update({"requests": requests})
+                requests = []
             return True
-        except Exception as e:
-            print(f"Error saving {worksheet_name} data: {e}")
+        except Exception:
+            logger.exception("Error saving %s data", worksheet_name)
+            self._ws_cache.pop(worksheet_name, None)  # The sheet may have been renamed or deleted
             return False
+        finally:
+            # Drop the cached read even on failure, as the write may have partly applied
+            self.invalidate_worksheet_cache(worksheet_name)
+
+    def _add_worksheet(self, worksheet_name: str, headers: list) -> gspread.Worksheet:
+        """Create a worksheet and write its header row"""
+        worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=26)
+        worksheet.update([headers])
+        return worksheet
 
-    def create_worksheet_if_not_exists(self, worksheet_name: str, headers: list) -> bool:
-        """Create worksheet if it doesn't exist"""
+    def create_worksheets_if_not_exist(self, worksheets: Dict[str, list]) -> bool:
+        """Create any missing worksheets, given as {name: headers}, listing existing ones once"""
         try:
-            # Check if worksheet exists
-            try:
-                worksheet = self.spreadsheet.worksheet(worksheet_name)
-            except gspread.exceptions.WorksheetNotFound:
-                # Create new worksheet
-                worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=26)
-                # Add headers
-                worksheet.update([headers])
+            existing = {worksheet.title: worksheet for worksheet in self.spreadsheet.worksheets()}
+            # The listing already holds every handle, so keep them for later lookups
+            self._ws_cache.update(existing)
+            missing = [(name, headers) for name, headers in worksheets.items() if name not in existing]
+            if missing:
+                # Each creation is two round trips (add + headers); run them concurrently
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    created = list(executor.map(lambda item: self._add_worksheet(*item), missing))
+                for (worksheet_name, _), worksheet in zip(missing, created):
+                    self._ws_cache[worksheet_name] = worksheet
             return True
-        except Exception as e:
-            print(f"Error creating worksheet {worksheet_name}: {e}")
+        except Exception:
+            logger.exception("Error creating worksheets")
             return False
 
-# Global database instance
-db = GoogleSheetsDB()
+class AsyncGoogleSheetsDB:
+    """Awaitable facade over GoogleSheetsDB for async endpoints; the blocking
+    Sheets calls run in the threadpool instead of on the event loop"""
+
+    def __init__(self, sync_db: GoogleSheetsDB):
+        self._sync = sync_db
+
+    async def create_worksheets_if_not_exist(self, worksheets: Dict[str, list]) -> bool:
+        return await run_in_threadpool(self._sync.create_worksheets_if_not_exist, worksheets)
+
+@functools.cache
+def get_db() -> GoogleSheetsDB:
+    """Dependency to get database instance, connecting on first use"""
+    return GoogleSheetsDB()
+
+@functools.cache
+def get_async_db() -> AsyncGoogleSheetsDB:
+    """Dependency to get the awaitable database facade for async endpoints"""
+    return AsyncGoogleSheetsDB(get_db())
 
 async def init_db():
     """Initialize database connection"""
-    global db
     try:
+        # Connecting authorizes and opens the spreadsheet over HTTP; keep it off the loop
+        db = await run_in_threadpool(get_db)
+        async_db = get_async_db()
         if not db.initialized:
-            print("=" * 60)
-            print("WARNING: Google Sheets connection not initialized!")
-            if db.error_message:
-                print(f"Error: {db.error_message}")
-            print("\nTo fix this, ensure you have:")
-            print("1. Google service account JSON file: tgyn-admin-1452dbad90f6.json")
-            print("2. config.json with 'apis.google_sheets.spreadsheet_url' configured")
-            print("   OR set GOOGLE_SPREADSHEET_URL environment variable")
-            print("=" * 60)
+            # The help text is only assembled when warnings are actually emitted
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Google Sheets connection not initialized!%s\n"
+                    "To fix this, ensure you have:\n"
+                    "1. Google service account JSON file: tgyn-admin-1452dbad90f6.json\n"
+                    "   (or GOOGLE_APPLICATION_CREDENTIALS pointing at one)\n"
+                    "2. config.json with 'apis.google_sheets.spreadsheet_url' configured\n"
+                    "   OR set GOOGLE_SPREADSHEET_URL environment variable",
+                    f"\nError: {db.error_message}" if db.error_message else "",
+                )
             return
 
-        # Test connection by getting users
-        users_df = db.get_users_df()
-        print(f"Database initialized. Found {len(users_df)} users.")
-
-        # Create necessary worksheets if they don't exist
-        db.create_worksheet_if_not_exists("Users", ["username", "password", "role", "email"])
-        db.create_worksheet_if_not_exists("Events", ["id", "name", "date", "type", "created_by", "created_at"])
-        db.create_worksheet_if_not_exists("Budgets", ["event_id", "income_data", "expense_data", "created_at"])
-        db.create_worksheet_if_not_exists("SOAs", ["event_id", "income_data", "expense_data", "receipts", "created_at"])
-        print("Required worksheets verified/created successfully.")
-
-    except Exception as e:
-        print(f"Failed to initialize database: {e}")
-        import traceback
-        traceback.print_exc()
-        # Don't raise - allow server to start even if DB init fails
+        required_worksheets = {
+            "Users": ["username", "password", "role", "email"],
+            "Events": ["id", "name", "date", "type", "created_by", "created_at"],
+            "Budgets": ["event_id", "income_data", "expense_data", "created_at"],
+            "SOAs": ["event_id", "income_data", "expense_data", "receipts", "created_at"],
+        }
+        # The worksheet listing (one metadata request, then only the misses are created)
+        # doubles as the connection test; reading the sheets' rows here would only warm
+        # a cache that expires long before most first requests
+        if await async_db.create_worksheets_if_not_exist(required_worksheets):
+            logger.info("Database initialized. Required worksheets verified/created successfully.")
 
-def get_db() -> GoogleSheetsDB:
-    """Dependency to get database instance"""
-    return db
\ No newline at end of file
+    except Exception:
+        logger.exception("Failed to initialize database")
+        # Don't raise - allow server to start even if DB init fails
@@ -1,15 +1,24 @@
 import google.generativeai as genai
+from google.generativeai.types import generation_types
+import httpx
+from google.api_core import exceptions as google_exceptions
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+import asyncio
+import copy
+import functools
 import io
-import json
+import orjson
 import os
-from datetime import datetime
+import random
+import threading
+from datetime import date, datetime
 from typing import List, Dict, Any, Optional
-from app.utils.config import get_gemini_api_key
+from app.utils.config import get_gemini_api_key, get_gemini_service_tier
 from app.services.attendance_service import AttendanceService
 from pydantic import BaseModel
 
@@ -24,65 +33,86 @@ class MeetingMinutesRequest(BaseModel):
     meeting_chair: Optional[str] = None
 
 
-class MinutesService:
-    def __init__(self):
-        # Get API key from configuration
-        api_key = get_gemini_api_key()
+# Response schema for the minutes prompt. Gemini is asked for JSON matching it
+# directly, so replies carry no markdown framing to strip. Fields have no
+# defaults because the Gemini schema format has no "default" keyword
+class AgendaItem(BaseModel):
+    item_number: int
+    title: str
+    description: str
+    action_items: List[str]
 
-        if not api_key:
-            raise ValueError("Gemini API key not found in configuration")
 
-        genai.configure(api_key=api_key)
-        self._model = None  # Lazy initialization
-        self._api_key = api_key
+class ProcessedMeeting(BaseModel):
+    meeting_title: str
+    agenda_items: List[AgendaItem]
+    extracted_date: Optional[str]
+    extracted_location: Optional[str]
+    extracted_company: Optional[str]
 
-    def _initialize_gemini_model(self):
-        """Initialize Gemini model with preferred settings"""
-        try:
-            # Try preferred models in order
-            preferred_models = ['gemini-2.0-flash-exp', 'gemini-2.0-flash', 'gemini-1.5-pro', 'gemini-1.5-flash']
 
-            for model_name in preferred_models:
+# Gemini models shared by every MinutesService, keyed by API key. The router builds
+# a MinutesService per request; choosing the model (and listing models for the
+# fallback) is done once per process instead
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _initialize_gemini_model():
+    """Initialize Gemini model with preferred settings"""
+    try:
+        # Try preferred models in order
+        preferred_models = ['gemini-2.0-flash-exp', 'gemini-2.0-flash', 'gemini-1.5-pro', 'gemini-1.5-flash']
+
+        for model_name in preferred_models:
+            try:
+                model = genai.GenerativeModel(model_name)
+                print(f"Using Gemini model: {model_name}")
+                return model
+            except Exception as e:
+                print(f"Model {model_name} failed: {e}")
+                continue
+
+        # Fallback to any available model
+        models = genai.list_models()
+        for model_info in models:
+            if 'generateContent' in model_info.supported_generation_methods:
                 try:
-                    model = genai.GenerativeModel(model_name)
-                    print(f"Using Gemini model: {model_name}")
+                    model = genai.GenerativeModel(model_info.name)
+                    print(f"Using fallback model: {model_info.name}")
                     return model
-                except Exception as e:
-                    print(f"Model {model_name} failed: {e}")
+                except:
                     continue
 
-            # Fallback to any available model
-            models = genai.list_models()
-            for model_info in models:
-                if 'generateContent' in model_info.supported_generation_methods:
-                    try:
-                        model = genai.GenerativeModel(model_info.name)
-                        print(f"Using fallback model: {model_info.name}")
-                        return model
-                    except:
-                        continue
+        raise Exception("No suitable Gemini model found")
 
-            raise Exception("No suitable Gemini model found")
+    except Exception as e:
+        raise Exception(f"Failed to initialize Gemini model: {e}")
 
-        except Exception as e:
-            raise Exception(f"Failed to initialize Gemini model: {e}")
 
+@functools.lru_cache(maxsize=1)
+def _configure_genai() -> str:
+    """Configure the genai client with the Gemini API key, once per process (use
+    .cache_clear() to reload). Returns the key"""
+    api_key = get_gemini_api_key()
+    if not api_key:
+        raise ValueError("Gemini API key not found in configuration")
+    genai.configure(api_key=api_key)
+    return api_key
 
-    def _get_model(self):
-        """Get or initialize the Gemini model (lazy initialization)"""
-        if self._model is None:
+
+def _get_or_create_model(api_key: str):
+    """Get the shared Gemini model for api_key, initializing it on first use"""
+    with _models_lock:
+        model = _models.get(api_key)
+        if model is None:
             print("Initializing Gemini model...")
-            self._model = self._initialize_gemini_model()
+            model = _models[api_key] = _initialize_gemini_model()
             print("Gemini model initialized successfully")
-        return self._model
+        return model
 
-    def process_content_with_gemini(self, content: str) -> Dict[str, Any]:
-        """Process meeting content with Gemini to extract structured information"""
-        try:
-            # Get model (will initialize if needed)
-            model = self._get_model()
-            
-            prompt = """
+
+_MINUTES_PROMPT = """
             You are an expert at analyzing meeting information and extracting structured data for meeting minutes.
 
             Analyze the following meeting content and extract:
@@ -117,56 +147,197 @@ class MinutesService:
             5. Return ONLY the JSON, no other text
             """
 
-            # Process the content
-            print(f"Processing {len(content)} characters with Gemini...")
-            response = model.generate_content([
-                prompt,
-                content
-            ])
-            print("Got response from Gemini")
-
-            # Parse response
-            response_text = response.text.strip()
+# Flex tier requests go straight to the REST API (the SDK has no service tier
+# option). They may queue for several minutes, hence the long read timeout
+_GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/{model}:generateContent"
+_flex_http: Optional[httpx.Client] = None
+
+# Paragraph properties shared by the section headers, built once and copied into
+# each header instead of being reconstructed attribute by attribute
+_HEADER_SHADING = OxmlElement('w:shd', {qn('w:fill'): 'F8D7DA'})  # Light pink
+_HEADER_SPACING = OxmlElement('w:spacing', {qn('w:before'): '120', qn('w:after'): '120'})
+
+def _find_logo_path() -> Optional[str]:
+    """Locate the TGYN logo used at the top of the minutes"""
+    # Try multiple possible paths to find the logo
+    current_file = os.path.abspath(__file__)
+    possible_paths = [
+        # Path 1: Absolute path (most reliable)
+        '/Users/nathanielneo/Desktop/TGYN_Admin/Image/TGYN Logo S.jpeg',
+        # Path 2: From backend/app/services/minutes_service.py -> go up 4 levels
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file)))), 'Image', 'TGYN Logo S.jpeg'),
+        # Path 3: Relative from backend directory
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_file))), '..', 'Image', 'TGYN Logo S.jpeg'),
+        # Path 4: From project root (if running from root)
+        os.path.join(os.getcwd(), 'Image', 'TGYN Logo S.jpeg'),
+        # Path 5: Try from current working directory with various parent levels
+        os.path.join(os.getcwd(), '..', 'Image', 'TGYN Logo S.jpeg'),
+    ]
+
+    for path in possible_paths:
+        normalized_path = os.path.normpath(path)
+        if os.path.exists(normalized_path):
+            return normalized_path
+
+    print(f"Logo file not found. Tried paths: {possible_paths}")
+    print(f"Current working directory: {os.getcwd()}")
+    print(f"Current file: {current_file}")
+    return None
+
+
+def _load_logo() -> Optional[bytes]:
+    """Read the logo once; every generated document embeds it from memory"""
+    logo_path = _find_logo_path()
+    if logo_path is None:
+        return None
+    try:
+        with open(logo_path, 'rb') as f:
+            logo_bytes = f.read()
+        print(f"Loaded minutes logo from: {logo_path}")
+        return logo_bytes
+    except OSError as e:
+        print(f"Error reading logo: {e}")
+        return None
+
+
+_LOGO_BYTES = _load_logo()
+
+def _format_meeting_date(date_part: str) -> str:
+    """Format a YYYY-MM-DD date as e.g. "September 21, 2025", or return it unchanged"""
+    try:
+        # fromisoformat is much cheaper than strptime for the usual zero-padded dates
+        parsed = date.fromisoformat(date_part)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(date_part, "%Y-%m-%d")  # Also accepts e.g. 2025-9-1
+        except ValueError:
+            return date_part
+    return parsed.strftime("%B %d, %Y")
+
+# JSON mode generation config, converted to the API's schema format once
+_MINUTES_GENERATION_CONFIG = generation_types.to_generation_config_dict({
+    "response_mime_type": "application/json",
+    "response_schema": ProcessedMeeting,
+})
+# The same config in REST form, for Flex tier requests
+_FLEX_GENERATION_CONFIG = {
+    "responseMimeType": "application/json",
+    "responseSchema": orjson.loads(genai.protos.Schema.to_json(
+        _MINUTES_GENERATION_CONFIG["response_schema"],
+        use_integers_for_enums=False,
+        always_print_fields_with_no_presence=False,
+        indent=None,
+    )),
+}
+
+# Attempts per async Gemini call when it is rate limited
+_GEMINI_MAX_ATTEMPTS = 4
+
+
+def _strip_code_fence(response_text: str) -> str:
+    """Strip surrounding whitespace and a ```json fence from a model response"""
+    response_text = response_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    if response_text.startswith("```"):
+        response_text = response_text[3:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+
+def _parse_minutes_response(response_text: str, content: str) -> Dict[str, Any]:
+    """Parse Gemini's JSON answer for one meeting, falling back to a default structure"""
+    # JSON mode replies are bare JSON; only clean up the text if that fails
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        pass
+
+    response_text = _strip_code_fence(response_text)
+
+    # Find JSON in response
+    json_start = response_text.find('{')
+    json_end = response_text.rfind('}') + 1
+
+    if json_start != -1 and json_end > json_start:
+        response_text = response_text[json_start:json_end]
+
+    # Parse JSON
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError as json_err:
+        print(f"JSON decode error: {json_err}")
+        print(f"Response text that failed to parse: {response_text[:500]}")
+        # Return a default structure if JSON parsing fails
+        return _default_minutes_data(content)
+
+
+def _default_minutes_data(content: str) -> Dict[str, Any]:
+    """Minimal structure used when Gemini's response can't be parsed"""
+    return {
+        "meeting_title": "Meeting",
+        "agenda_items": [
+            {
+                "item_number": 1,
+                "title": "General Discussion",
+                "description": content[:500] if len(content) > 0 else "No content extracted",
+                "action_items": []
+            }
+        ],
+        "extracted_date": None,
+        "extracted_location": None,
+        "extracted_company": None
+    }
 
-            # Clean the response text
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
 
-            response_text = response_text.strip()
+class MinutesService:
+    def __init__(self):
+        self._api_key = _configure_genai()
 
-            # Find JSON in response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
+    def _get_model(self):
+        """Get the Gemini model (shared across instances, initialized on first use)"""
+        return _get_or_create_model(self._api_key)
+
+    def _generate_flex(self, model_name: str, content: str) -> str:
+        """Run the minutes prompt on the Flex service tier and return the response text"""
+        global _flex_http
+        with _models_lock:
+            if _flex_http is None:
+                _flex_http = httpx.Client(timeout=httpx.Timeout(900, connect=10))
+            client = _flex_http
+        response = client.post(
+            _GEMINI_API_URL.format(model=model_name),
+            headers={"x-goog-api-key": self._api_key},
+            json={
+                "contents": [{"role": "user", "parts": [{"text": _MINUTES_PROMPT}, {"text": content}]}],
+                "generationConfig": _FLEX_GENERATION_CONFIG,
+                "serviceTier": "FLEX",
+            },
+        )
+        response.raise_for_status()
+        parts = orjson.loads(response.content)["candidates"][0]["content"]["parts"]
+        return "".join(part.get("text", "") for part in parts)
+
+    def process_content_with_gemini(self, content: str, service_tier: str = "standard") -> Dict[str, Any]:
+        """Process meeting content with Gemini to extract structured information.
+        service_tier="flex" trades latency for cost on latency-tolerant callers"""
+        try:
+            # Get model (will initialize if needed)
+            model = self._get_model()
 
-            if json_start != -1 and json_end > json_start:
-                response_text = response_text[json_start:json_end]
+            # Process the content
+            print(f"Processing {len(content)} characters with Gemini...")
+            if service_tier == "flex":
+                response_text = self._generate_flex(model.model_name, content)
+            else:
+                response_text = model.generate_content(
+                    [_MINUTES_PROMPT, content],
+                    generation_config=_MINUTES_GENERATION_CONFIG,
+                ).text
+            print("Got response from Gemini")
 
-            # Parse JSON
-            try:
-                parsed_data = json.loads(response_text)
-                return parsed_data
-            except json.JSONDecodeError as json_err:
-                print(f"JSON decode error: {json_err}")
-                print(f"Response text that failed to parse: {response_text[:500]}")
-                # Return a default structure if JSON parsing fails
-                return {
-                    "meeting_title": "Meeting",
-                    "agenda_items": [
-                        {
-                            "item_number": 1,
-                            "title": "General Discussion",
-                            "description": powerpoint_text[:500] if len(powerpoint_text) > 0 else "No content extracted",
-                            "action_items": []
-                        }
-                    ],
-                    "extracted_date": None,
-                    "extracted_location": None,
-                    "extracted_company": None
-                }
+            return _parse_minutes_response(response_text, content)
 
         except Exception as e:
             print(f"Error processing content with Gemini: {e}")
@@ -174,6 +345,22 @@ class MinutesService:
             print(traceback.format_exc())
             raise Exception(f"Failed to process meeting content: {str(e)}")
 
+    async def aprocess_content_with_gemini(self, content: str) -> Dict[str, Any]:
+        """Async process_content_with_gemini: awaits Gemini instead of blocking a
+        thread, retrying rate-limit (429) errors with backoff"""
+        model = self._get_model()
+        for attempt in range(1, _GEMINI_MAX_ATTEMPTS + 1):
+            try:
+                response = await model.generate_content_async(
+                    [_MINUTES_PROMPT, content],
+                    generation_config=_MINUTES_GENERATION_CONFIG,
+                )
+                return _parse_minutes_response(response.text, content)
+            except google_exceptions.ResourceExhausted:
+                if attempt == _GEMINI_MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(random.uniform(0, 2 ** attempt))
+
     def generate_minutes_word(
         self, 
         request: MeetingMinutesRequest,
@@ -182,7 +369,19 @@ class MinutesService:
         """Generate meeting minutes Word document following the new format"""
         try:
             doc = Document()
-            
+
+            # Body text (Calibri 11) and headings (Calibri 12, bold, dark gray) are set
+            # once as paragraph styles rather than on every run
+            body_style = doc.styles.add_style('MinutesBody', WD_STYLE_TYPE.PARAGRAPH)
+            body_style.base_style = doc.styles['Normal']
+            body_style.font.name = 'Calibri'
+            body_style.font.size = Pt(11)
+            heading_style = doc.styles.add_style('MinutesHeading', WD_STYLE_TYPE.PARAGRAPH)
+            heading_style.base_style = body_style
+            heading_style.font.size = Pt(12)
+            heading_style.font.bold = True
+            heading_style.font.color.rgb = RGBColor(50, 50, 50)  # Dark gray text
+
             # Set page margins
             sections = doc.sections
             for section in sections:
@@ -193,29 +392,7 @@ class MinutesService:
 
             # Add logo at the top left
             try:
-                # Try multiple possible paths to find the logo
-                current_file = os.path.abspath(__file__)
-                possible_paths = [
-                    # Path 1: Absolute path (most reliable)
-                    '/Users/nathanielneo/Desktop/TGYN_Admin/Image/TGYN Logo S.jpeg',
-                    # Path 2: From backend/app/services/minutes_service.py -> go up 4 levels
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file)))), 'Image', 'TGYN Logo S.jpeg'),
-                    # Path 3: Relative from backend directory
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_file))), '..', 'Image', 'TGYN Logo S.jpeg'),
-                    # Path 4: From project root (if running from root)
-                    os.path.join(os.getcwd(), 'Image', 'TGYN Logo S.jpeg'),
-                    # Path 5: Try from current working directory with various parent levels
-                    os.path.join(os.getcwd(), '..', 'Image', 'TGYN Logo S.jpeg'),
-                ]
-                
-                logo_path = None
-                for path in possible_paths:
-                    normalized_path = os.path.normpath(path)
-                    if os.path.exists(normalized_path):
-                        logo_path = normalized_path
-                        break
-                
-                if logo_path and os.path.exists(logo_path):
+                if _LOGO_BYTES is not None:
                     # Create a paragraph for the logo at the very beginning
                     logo_paragraph = doc.add_paragraph()
                     logo_paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -224,15 +401,10 @@ class MinutesService:
                     run = logo_paragraph.add_run()
                     # Add image with width of 1.5 inches (adjust as needed)
                     # Height will be calculated automatically to maintain aspect ratio
-                    run.add_picture(logo_path, width=Inches(1.5))
-                    print(f"Logo added successfully from: {logo_path}")
+                    run.add_picture(io.BytesIO(_LOGO_BYTES), width=Inches(1.5))
                     
                     # Add spacing after logo
                     doc.add_paragraph()
-                else:
-                    print(f"Logo file not found. Tried paths: {possible_paths}")
-                    print(f"Current working directory: {os.getcwd()}")
-                    print(f"Current file: {current_file}")
             except Exception as e:
                 import traceback
                 print(f"Error adding logo: {e}")
@@ -241,27 +413,16 @@ class MinutesService:
 
             # Helper function to add section header with pink background
             def add_section_header(text, number=None):
-                p = doc.add_paragraph()
+                p = doc.add_paragraph(style=heading_style)
                 if number:
-                    run = p.add_run(f"{number}. {text}")
+                    p.add_run(f"{number}. {text}")
                 else:
-                    run = p.add_run(text)
-                run.font.size = Pt(12)
-                run.font.name = 'Calibri'
-                run.bold = True
-                run.font.color.rgb = RGBColor(50, 50, 50)  # Dark gray text
-                
-                # Add light pink background
+                    p.add_run(text)
+
+                # Add light pink background, with spacing before and after
                 pPr = p._element.get_or_add_pPr()
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), 'F8D7DA')  # Light pink
-                pPr.append(shd)
-                
-                # Add spacing before and after
-                spacing = OxmlElement('w:spacing')
-                spacing.set(qn('w:before'), '120')
-                spacing.set(qn('w:after'), '120')
-                pPr.append(spacing)
+                pPr.append(copy.deepcopy(_HEADER_SHADING))
+                pPr.append(copy.deepcopy(_HEADER_SPACING))
                 
                 return p
 
@@ -272,21 +433,11 @@ class MinutesService:
                 try:
                     if 'T' in request.date_time:
                         date_part, time_part = request.date_time.split('T')
-                        try:
-                            from datetime import datetime
-                            dt = datetime.strptime(date_part, "%Y-%m-%d")
-                            date_str = dt.strftime("%B %d, %Y")  # e.g., "September 21, 2025"
-                        except:
-                            date_str = date_part
+                        date_str = _format_meeting_date(date_part)  # e.g., "September 21, 2025"
                         time_str = time_part[:5] if len(time_part) >= 5 else time_part
                     else:
-                        try:
-                            from datetime import datetime
-                            dt = datetime.strptime(request.date_time, "%Y-%m-%d")
-                            date_str = dt.strftime("%B %d, %Y")
-                        except:
-                            date_str = request.date_time
-                except:
+                        date_str = _format_meeting_date(request.date_time)
+                except ValueError:
                     date_str = request.date_time
 
             # Title - Centered, large, bold
@@ -318,9 +469,7 @@ class MinutesService:
             
             # Add light pink background to attendance header
             pPr = attendance_heading._element.get_or_add_pPr()
-            shd = OxmlElement('w:shd')
-            shd.set(qn('w:fill'), 'F8D7DA')
-            pPr.append(shd)
+            pPr.append(copy.deepcopy(_HEADER_SHADING))
             
             # Fetch attendance data from Google Sheets - use most recent date
             present_members = []
@@ -329,8 +478,7 @@ class MinutesService:
             try:
                 # Get the most recent attendance from Google Sheets
                 attendance_service = AttendanceService()
-                members = attendance_service.get_members()
-                attendance_data, attendance_date_used = attendance_service.get_most_recent_attendance()
+                members, attendance_data, attendance_date_used = attendance_service.get_members_and_recent_attendance()
                 
                 print(f"Using attendance data from date: {attendance_date_used}")
                 
@@ -368,37 +516,25 @@ class MinutesService:
             
             # Present Section
             if present_members:
-                present_heading = doc.add_paragraph()
-                present_heading_run = present_heading.add_run("Present")
-                present_heading_run.font.size = Pt(12)
-                present_heading_run.font.name = 'Calibri'
-                present_heading_run.bold = True
-                present_heading_run.font.color.rgb = RGBColor(50, 50, 50)
+                present_heading = doc.add_paragraph(style=heading_style)
+                present_heading.add_run("Present")
                 present_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 
                 for member in present_members:
-                    p = doc.add_paragraph()
+                    p = doc.add_paragraph(style=body_style)
                     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
                     run = p.add_run(f"{member['address']} {member['name']}")
-                    run.font.size = Pt(11)
-                    run.font.name = 'Calibri'
             
             # Absent with Apologies Section
             if absent_members:
-                absent_heading = doc.add_paragraph()
-                absent_heading_run = absent_heading.add_run("Absent with Apologies")
-                absent_heading_run.font.size = Pt(12)
-                absent_heading_run.font.name = 'Calibri'
-                absent_heading_run.bold = True
-                absent_heading_run.font.color.rgb = RGBColor(50, 50, 50)
+                absent_heading = doc.add_paragraph(style=heading_style)
+                absent_heading.add_run("Absent with Apologies")
                 absent_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 
                 for member in absent_members:
-                    p = doc.add_paragraph()
+                    p = doc.add_paragraph(style=body_style)
                     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
                     run = p.add_run(f"{member['address']} {member['name']}")
-                    run.font.size = Pt(11)
-                    run.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
@@ -410,14 +546,10 @@ class MinutesService:
             ]
             
             for label, value in metadata_items:
-                p = doc.add_paragraph()
+                p = doc.add_paragraph(style=body_style)
                 run1 = p.add_run(f"{label} ")
-                run1.font.size = Pt(11)
-                run1.font.name = 'Calibri'
                 run1.bold = True
                 run2 = p.add_run(value)
-                run2.font.size = Pt(11)
-                run2.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
@@ -430,10 +562,8 @@ class MinutesService:
             add_section_header("Call to Order", 1)
             chair = request.meeting_chair or "[Chairperson's Name]"
             time_display = time_str or "[Time]"
-            call_to_order_p = doc.add_paragraph()
+            call_to_order_p = doc.add_paragraph(style=body_style)
             call_to_order_run = call_to_order_p.add_run(f"The meeting was called to order by {chair} at {time_display}.")
-            call_to_order_run.font.size = Pt(11)
-            call_to_order_run.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
@@ -447,34 +577,26 @@ class MinutesService:
                 action_items = item.get('action_items', [])
                 
                 # Sub-section title (bold)
-                sub_p = doc.add_paragraph()
+                sub_p = doc.add_paragraph(style=body_style)
                 sub_run = sub_p.add_run(title)
-                sub_run.font.size = Pt(11)
-                sub_run.font.name = 'Calibri'
                 sub_run.bold = True
                 
                 # Description with bullet
-                desc_p = doc.add_paragraph()
+                desc_p = doc.add_paragraph(style=body_style)
                 desc_run = desc_p.add_run(f"• {description}")
-                desc_run.font.size = Pt(11)
-                desc_run.font.name = 'Calibri'
                 
                 # Action items if any
                 if action_items:
                     for ai in action_items[:2]:  # Limit action items
-                        ai_p = doc.add_paragraph()
+                        ai_p = doc.add_paragraph(style=body_style)
                         ai_run = ai_p.add_run(f"• {str(ai)}")
-                        ai_run.font.size = Pt(11)
-                        ai_run.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
             # Section 3: Ongoing Issues
             add_section_header("Ongoing Issues", 3)
-            ongoing_p = doc.add_paragraph()
+            ongoing_p = doc.add_paragraph(style=body_style)
             ongoing_run = ongoing_p.add_run("Items that were set aside in previous meetings.")
-            ongoing_run.font.size = Pt(11)
-            ongoing_run.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
@@ -493,24 +615,18 @@ class MinutesService:
                 action_items = item.get('action_items', [])
                 
                 # Item title (bold)
-                item_p = doc.add_paragraph()
+                item_p = doc.add_paragraph(style=body_style)
                 item_run = item_p.add_run(title)
-                item_run.font.size = Pt(11)
-                item_run.font.name = 'Calibri'
                 item_run.bold = True
                 
                 # Description with bullet
-                desc_p = doc.add_paragraph()
+                desc_p = doc.add_paragraph(style=body_style)
                 desc_run = desc_p.add_run(f"• {description}")
-                desc_run.font.size = Pt(11)
-                desc_run.font.name = 'Calibri'
                 
                 # Action items
                 for ai in action_items[:2]:
-                    ai_p = doc.add_paragraph()
+                    ai_p = doc.add_paragraph(style=body_style)
                     ai_run = ai_p.add_run(f"• {str(ai)}")
-                    ai_run.font.size = Pt(11)
-                    ai_run.font.name = 'Calibri'
             
             doc.add_paragraph()  # Spacing
 
@@ -523,14 +639,10 @@ class MinutesService:
             ]
             
             for label, value in next_meeting_items:
-                p = doc.add_paragraph()
+                p = doc.add_paragraph(style=body_style)
                 run1 = p.add_run(f"{label} ")
-                run1.font.size = Pt(11)
-                run1.font.name = 'Calibri'
                 run1.bold = True
                 run2 = p.add_run(value)
-                run2.font.size = Pt(11)
-                run2.font.name = 'Calibri'
 
             # Save to bytes
             output = io.BytesIO()
@@ -569,7 +681,7 @@ class MinutesService:
             # Process with Gemini (with fallback if it fails)
             print("Processing with Gemini...")
             try:
-                processed_data = self.process_content_with_gemini(content)
+                processed_data = self.process_content_with_gemini(content, service_tier=get_gemini_service_tier())
                 print(f"Processed data: {processed_data}")
             except Exception as gemini_error:
                 print(f"Gemini processing failed: {gemini_error}")
@@ -1,9 +1,9 @@
 import pandas as pd
 import io
-import xlsxwriter
 from datetime import date
 from typing import List, Dict, Any
 from pydantic import BaseModel
+from app.utils.dates import format_event_date
 
 class SOAItem(BaseModel):
     description: str
@@ -34,6 +34,8 @@ class SOAService:
     @staticmethod
     def generate_soa_excel(request: SOARequest) -> bytes:
         """Generate SOA Excel file"""
+        import xlsxwriter
+
         output = io.BytesIO()
         workbook = xlsxwriter.Workbook(output, {'in_memory': True})
         sheet = workbook.add_worksheet("Sheet1")
@@ -73,13 +75,7 @@ class SOAService:
         sheet.write(4, 3, request.event_name, fmt_header_val)
 
         sheet.write(5, 1, "Date / Time / Venue:", fmt_header_left)
-        # Parse date string to format it
-        from datetime import datetime
-        try:
-            parsed_date = datetime.fromisoformat(request.event_date.replace('T', ' ').split('.')[0])
-            formatted_date = parsed_date.strftime('%d-%b-%y')
-        except:
-            formatted_date = request.event_date  # fallback to original string
+        formatted_date = format_event_date(request.event_date)
         sheet.write(5, 3, f"{formatted_date} / {request.venue}", fmt_header_val)
         sheet.write(5, 5, "Activity Code:", fmt_header_left)
         sheet.write(5, 6, request.activity_code, fmt_header_val)
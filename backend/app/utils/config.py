@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 from typing import Dict, Any, Optional
@@ -147,10 +148,13 @@ def get_config(key: str, default: Any = None) -> Any:
     """Get configuration value"""
     return config_manager.get(key, default)
 
+# Telegram credentials are read on every send; cache them (use .cache_clear() to reload)
+@functools.lru_cache(maxsize=1)
 def get_telegram_token() -> str:
     """Get Telegram bot token"""
     return get_config("apis.telegram.token", "")
 
+@functools.lru_cache(maxsize=1)
 def get_telegram_group_id() -> str:
     """Get Telegram group ID"""
     return get_config("apis.telegram.group_id", "")
@@ -159,12 +163,20 @@ def get_gemini_api_key() -> str:
     """Get Gemini API key"""
     return get_config("apis.gemini.api_key", "")
 
+def get_gemini_service_tier() -> str:
+    """Get the Gemini service tier for minutes generation ("standard" or "flex")"""
+    return get_config("apis.gemini.service_tier", "standard")
+
 def get_google_sheets_url() -> str:
     """Get Google Sheets URL"""
     return get_config("apis.google_sheets.spreadsheet_url", "")
 
 def get_google_service_account_file() -> str:
     """Get Google service account file path"""
+    # The standard google-auth variable takes precedence over config.json
+    env_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if env_path:
+        return env_path
     filename = get_config("apis.google_sheets.service_account_file", "tgyn-admin-1452dbad90f6.json")
     # Try multiple possible locations
     possible_paths = [
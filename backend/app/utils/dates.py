@@ -0,0 +1,19 @@
+import sys
+from datetime import datetime
+
+# Python 3.11+ fromisoformat accepts the 'T' separator, fractional seconds and offsets directly
+_FROMISOFORMAT_FULL = sys.version_info >= (3, 11)
+
+
+def format_event_date(event_date: str) -> str:
+    """Format an ISO event date string as e.g. 01-Jan-24, falling back to the original string"""
+    if _FROMISOFORMAT_FULL:
+        try:
+            return datetime.fromisoformat(event_date).strftime('%d-%b-%y')
+        except ValueError:
+            pass
+    try:
+        parsed_date = datetime.fromisoformat(event_date.replace('T', ' ').split('.')[0])
+        return parsed_date.strftime('%d-%b-%y')
+    except (ValueError, TypeError):
+        return event_date  # fallback to original string
@@ -0,0 +1,18 @@
+import logging
+import logging.handlers
+import queue
+
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Configure the root logger to hand records to a background thread.
+
+    Request handlers only enqueue records; the returned listener does the
+    actual stream writes. Call .stop() on shutdown to flush pending records.
+    """
+    logging.basicConfig(level=level)
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterator
+
+import orjson
+from fastapi.responses import ORJSONResponse as _BaseORJSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Response types sent as-is by DownloadAwareGZipMiddleware: xlsx/docx are already
+# zip archives, so gzipping them costs CPU for no size gain
+UNCOMPRESSED_CONTENT_TYPES = (
+    "application/vnd.openxmlformats-officedocument.",
+    "application/zip",
+    "image/",
+)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize values orjson does not handle natively (e.g. coming out of pandas)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    # numpy scalars (float64, int64, bool_) expose .item() to get the Python value
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError
+
+
+class ORJSONResponse(_BaseORJSONResponse):
+    """ORJSONResponse that also serializes Decimal and numpy scalar values"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+def iter_chunks(data: bytes, chunk_size: int = 65536) -> Iterator[memoryview]:
+    """Yield zero-copy slices of a file body for StreamingResponse"""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+class _DownloadAwareGZipResponder(GZipResponder):
+    """GZipResponder that also passes UNCOMPRESSED_CONTENT_TYPES through untouched"""
+
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(UNCOMPRESSED_CONTENT_TYPES):
+                self.content_type_is_excluded = True
+
+
+class DownloadAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips already-compressed file downloads"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _DownloadAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
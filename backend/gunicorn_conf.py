@@ -0,0 +1,16 @@
+# Gunicorn configuration for running the API in production:
+#   cd backend
+#   gunicorn -c gunicorn_conf.py app.main:app
+import multiprocessing
+
+from decouple import config
+
+bind = f"0.0.0.0:{config('PORT', default=8000)}"
+
+# UvicornWorker picks up uvloop and httptools automatically when they are
+# installed (both come with uvicorn[standard])
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = config("WORKERS", default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+
+# Minutes generation waits on Gemini, which can take well over the default 30s
+timeout = config("WORKER_TIMEOUT", default=120, cast=int)
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from app.services.database import GoogleSheetsDB
+
+
+class FakeWorksheet:
+    """Worksheet handle whose grid size is fixed when it is fetched, like gspread's"""
+
+    def __init__(self, sheet_id, row_count, col_count):
+        self.id = sheet_id
+        self.row_count = row_count
+        self.col_count = col_count
+
+
+class FakeSpreadsheet:
+    """Holds one sheet's grid size and applies appendDimension requests to it"""
+
+    def __init__(self, row_count=1000, col_count=26):
+        self.sheet_id = 0
+        self.row_count = row_count
+        self.col_count = col_count
+
+    def worksheet(self, title):
+        return FakeWorksheet(self.sheet_id, self.row_count, self.col_count)
+
+    def fetch_sheet_metadata(self, params=None):
+        # The API leaves out a zero sheetId
+        return {"sheets": [{"properties": {"gridProperties": {"rowCount": self.row_count, "columnCount": self.col_count}}}]}
+
+    def batch_update(self, body):
+        for request in body["requests"]:
+            append = request.get("appendDimension")
+            if append is None:
+                continue
+            if append["dimension"] == "ROWS":
+                self.row_count += append["length"]
+            else:
+                self.col_count += append["length"]
+
+
+class SaveWorksheetDataTest(unittest.TestCase):
+    def setUp(self):
+        # Skip __init__, which would connect to Google Sheets
+        self.db = GoogleSheetsDB.__new__(GoogleSheetsDB)
+        self.db._ws_cache = {}
+        self.db._data_cache = {}
+        self.db._data_cache_lock = threading.Lock()
+        self.db.spreadsheet = FakeSpreadsheet()
+
+    def test_saving_twice_grows_the_grid_once(self):
+        df = pd.DataFrame({"name": [f"row {i}" for i in range(1499)]})  # 1500 rows with the header
+
+        self.assertTrue(self.db.save_worksheet_data("Events", df))
+        self.assertTrue(self.db.save_worksheet_data("Events", df))
+
+        self.assertEqual(self.db.spreadsheet.row_count, 1500)
+        self.assertEqual(self.db.spreadsheet.col_count, 26)
+
+    def test_save_after_an_outside_resize_uses_the_current_grid(self):
+        self.db._ws("Events")  # Cache a handle that still says 1000 rows
+        self.db.spreadsheet.row_count = 1200
+
+        df = pd.DataFrame({"name": [f"row {i}" for i in range(1499)]})
+        self.assertTrue(self.db.save_worksheet_data("Events", df))
+
+        self.assertEqual(self.db.spreadsheet.row_count, 1500)
+
+
+if __name__ == "__main__":
+    unittest.main()